@@ -7,6 +7,7 @@ from src.widgets.hyprlang import Hyprlang
 from src.widgets.notification import NotificationIndicator
 from src.widgets.systemmonitor import SystemMonitor
 from src.widgets.weather import Weather
+from src.widgets.battery import Battery
 
 class RightBar(Box):
     def __init__(self):
@@ -21,6 +22,7 @@ class RightBar(Box):
             Hyprlang(),
             SystemTray(),
             *( [Weather()] if SHELL_CONFIG.weather.get("enable", True) else [] ),
+            *( [Battery()] if SHELL_CONFIG.battery.get("enable", True) else [] ),
             NotificationIndicator()
         ],
         name="RIGHT")
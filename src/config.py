@@ -19,6 +19,9 @@ class ConfigParser:
         self.theme = self.conf.get("theme", {}) # defaults to empty dict if missing
         self.weather = self.conf.get("weather", {'enable': True})
         self.sysmon = self.conf.get("sysmon", {})
+        self.notifications = self.conf.get("notifications", {})
+        self.battery = self.conf.get("battery", {})
+        self.privacy = self.conf.get("privacy", {})
         self.general = self.conf.get("general", {})
 
 # Global Instance
@@ -0,0 +1,92 @@
+import time
+from functools import cache
+from fabric.widgets.box import Box
+from fabric.widgets.label import Label
+from fabric.widgets.wayland import WaylandWindow as Window
+
+from gi.repository import GLib, Gdk  # type:ignore
+
+from src.utils.privacy_log import PRIVACY_LOG, KIND_NAMES, AppUsage
+
+def format_duration(seconds: float) -> str:
+    minutes = round(seconds / 60)
+    if minutes < 1: return "<1m"
+    h, m = divmod(minutes, 60)
+    return f"{h}h {m:02d}m" if h else f"{m}m"
+
+class PrivacyLogPopup(Window):
+    """Which apps used the microphone, screen or camera today, read from the access log."""
+
+    def __init__(self):
+        super().__init__(
+            name="PRIVACYLOG",
+            layer="top",
+            anchor="top right",
+            margin="10px 10px 0px 0px",
+            keyboard_mode="on_demand",
+            visible=False,
+            all_visible=False,
+            exclusive=True
+        )
+        self.close_timer = None
+        self.connect("enter-notify-event", self.on_mouse_enter)
+        self.connect("leave-notify-event", self.on_mouse_leave)
+
+        self.box = Box(orientation="v", style_classes="privacy-log-view", spacing=6, size=(300, -1))
+        self.add(self.box)
+
+    def toggle(self, *_):
+        if self.get_visible():
+            self.hide()
+        else:
+            self.render()
+            self.show_all()
+
+    def render(self):
+        midnight = time.mktime(time.localtime()[:3] + (0, 0, 0, 0, 0, -1))
+        usage = PRIVACY_LOG.usage_since(midnight)
+
+        children = [Label("Today", style_classes="title", h_align="start")]
+        for kind, title in KIND_NAMES.items():
+            apps = usage.get(kind)
+            if not apps: continue
+            children.append(Label(title, style_classes="section-title", h_align="start"))
+            children.extend(self.app_row(app) for app in apps)
+        if len(children) == 1:
+            children.append(Label("Nothing used the microphone, screen or camera", style_classes="empty", h_align="start"))
+        self.box.children = children
+
+    @staticmethod
+    def app_row(app: AppUsage) -> Box:
+        last = "now" if app.active else time.strftime("%H:%M", time.localtime(app.last_used))
+        return Box(
+            orientation="h",
+            spacing=10,
+            style_classes=["privacy-log-row", *(["active"] if app.active else [])],
+            children=[
+                Label(app.name, h_align="start", h_expand=True, ellipsization="end"),
+                Label(f"{app.sessions}× · {format_duration(app.seconds)} · {last}", style_classes="details", h_align="end"),
+            ]
+        )
+
+    def on_mouse_enter(self, *_):
+        if self.close_timer:
+            GLib.source_remove(self.close_timer)
+            self.close_timer = None
+
+    def on_mouse_leave(self, _, event):
+        if event.detail == Gdk.NotifyType.INFERIOR:
+            return
+        if self.close_timer:
+            GLib.source_remove(self.close_timer)
+        self.close_timer = GLib.timeout_add(500, self.do_close_window)
+
+    def do_close_window(self):
+        self.close_timer = None
+        self.hide()
+        return False
+
+@cache
+def privacy_log_popup() -> PrivacyLogPopup:
+    """The popup is shared by the privacy indicator and the dashboard, built on first use."""
+    return PrivacyLogPopup()
@@ -0,0 +1,178 @@
+import time
+from fabric.widgets.box import Box
+from fabric.widgets.label import Label
+from fabric.widgets.wayland import WaylandWindow as Window
+from loguru import logger
+
+from gi.repository import GLib, Gdk  # type:ignore
+
+from src.utils.proc_scanner import ProcessScanner, ProcUsage
+from src.utils.cgroup_scanner import CgroupScanner, CgroupUsage
+from src.utils.threads import thread
+
+TOP_N = 5
+REFRESH_MS = 2000
+# Longer than this between scans (the popup was hidden) and the deltas are stale
+MAX_SCAN_GAP = 2 * REFRESH_MS / 1000
+# After a fresh baseline, sample again this soon instead of showing nothing
+BASELINE_SAMPLE = 0.25
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "K", "M", "G"):
+        if size < 1024: return f"{size:.0f}{unit}"
+        size /= 1024 # type: ignore
+    return f"{size:.1f}T"
+
+class ProcessRow(Box):
+    """One fixed row, updated in place with set_text on every refresh."""
+
+    def __init__(self):
+        self.name_label = Label("", style_classes="proc-name", h_align="start", h_expand=True, ellipsization="end")
+        self.value_label = Label("", style_classes="proc-value", h_align="end")
+        super().__init__(
+            orientation="h",
+            spacing=10,
+            style_classes="proc-row",
+            children=[self.name_label, self.value_label]
+        )
+
+    def set_row(self, name: str | None, tooltip: str = "", value: str = ""):
+        if name is None:
+            self.set_visible(False)
+            return
+        self.name_label.set_text(name)
+        self.name_label.set_tooltip_text(tooltip)
+        self.value_label.set_text(value)
+        self.set_visible(True)
+
+class ProcessPopup(Window):
+    def __init__(self):
+        super().__init__(
+            name="PROCESSES",
+            layer="top",
+            anchor="top right",
+            margin="10px 10px 0px 0px",
+            keyboard_mode="on_demand",
+            visible=False,
+            all_visible=False,
+            exclusive=True
+        )
+
+        self.scanner = ProcessScanner()
+        self.cgroups = CgroupScanner()
+        self.scanning = False
+        self.refresh_timer = None
+        self.close_timer = None
+
+        self.connect("enter-notify-event", self.on_mouse_enter)
+        self.connect("leave-notify-event", self.on_mouse_leave)
+
+        # --- ROWS ---
+        # Built once, a refresh only swaps label texts
+        self.cpu_rows = [ProcessRow() for _ in range(TOP_N)]
+        self.mem_rows = [ProcessRow() for _ in range(TOP_N)]
+        self.app_rows = [ProcessRow() for _ in range(TOP_N)]
+        self.app_section = Box(
+            orientation="v",
+            spacing=6,
+            children=[
+                Box(style_classes="divider", size=(260, 1)),
+                Label("Apps", style_classes="title", h_align="start"),
+                *self.app_rows,
+            ]
+        )
+
+        self.box = Box(
+            orientation="v",
+            style_classes="proc-view",
+            spacing=6,
+            size=(300, -1),
+            children=[
+                Label("Top CPU", style_classes="title", h_align="start"),
+                *self.cpu_rows,
+                Box(style_classes="divider", size=(260, 1)),
+                Label("Top Memory", style_classes="title", h_align="start"),
+                *self.mem_rows,
+                self.app_section,
+            ]
+        )
+        self.add(self.box)
+
+    def toggle(self):
+        if self.get_visible():
+            self.hide_popup()
+        else:
+            self.show_popup()
+
+    def show_popup(self):
+        self.show_all()
+        for row in self.cpu_rows + self.mem_rows + self.app_rows: row.set_visible(False)
+        self.app_section.set_visible(self.cgroups.available)
+        self.refresh()
+        if self.refresh_timer is None:
+            self.refresh_timer = GLib.timeout_add(REFRESH_MS, self.refresh)
+
+    def hide_popup(self):
+        # The scanner keeps its table (and resolved names), the first scan
+        # after reopening takes a new CPU baseline
+        if self.refresh_timer:
+            GLib.source_remove(self.refresh_timer)
+            self.refresh_timer = None
+        self.hide()
+
+    def refresh(self):
+        # Single flight: skip a tick rather than queue scans behind a slow one
+        if not self.scanning:
+            self.scanning = True
+            thread(self.scan)
+        return True
+
+    def scan(self):
+        try:
+            fresh = self.scanner.scan(MAX_SCAN_GAP)
+            fresh = self.cgroups.scan(MAX_SCAN_GAP) and fresh
+            if not fresh:
+                time.sleep(BASELINE_SAMPLE)
+                self.scanner.scan()
+                self.cgroups.scan()
+            top_cpu = self.scanner.top_cpu(TOP_N)
+            top_mem = self.scanner.top_memory(TOP_N)
+            top_apps = self.cgroups.top(TOP_N)
+        except Exception as e:
+            logger.error(f"[Processes] Scan failed: {e}")
+            top_cpu, top_mem, top_apps = [], [], []
+        GLib.idle_add(self.render, top_cpu, top_mem, top_apps)
+
+    def render(self, top_cpu: list[ProcUsage], top_mem: list[ProcUsage], top_apps: list[CgroupUsage]):
+        self.scanning = False
+        for i, row in enumerate(self.cpu_rows):
+            if i >= len(top_cpu): row.set_row(None); continue
+            usage = top_cpu[i]
+            row.set_row(usage.name, f"PID {usage.pid}", f"{usage.cpu_percent}󰏰")
+        for i, row in enumerate(self.mem_rows):
+            if i >= len(top_mem): row.set_row(None); continue
+            usage = top_mem[i]
+            row.set_row(usage.name, f"PID {usage.pid}", format_bytes(usage.rss))
+        for i, row in enumerate(self.app_rows):
+            if i >= len(top_apps): row.set_row(None); continue
+            app = top_apps[i]
+            row.set_row(app.name, f"{app.unit}\nIO: {format_bytes(app.io_rate)}/s",
+                        f"{app.cpu_percent}󰏰 · {format_bytes(app.memory)}")
+        return False
+
+    def on_mouse_enter(self, *_):
+        if self.close_timer:
+            GLib.source_remove(self.close_timer)
+            self.close_timer = None
+
+    def on_mouse_leave(self, _, event):
+        if event.detail == Gdk.NotifyType.INFERIOR:
+            return
+        if self.close_timer:
+            GLib.source_remove(self.close_timer)
+        self.close_timer = GLib.timeout_add(500, self.do_close_window)
+
+    def do_close_window(self):
+        self.close_timer = None
+        self.hide_popup()
+        return False
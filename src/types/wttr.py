@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import TypedDict, List
 
 # Helper for fields that look like [{"value": "..."}]
@@ -207,4 +208,83 @@ WEATHER_SYMBOL_GTK = {
     "ThunderyShowers": "weather-storm",
     "ThunderySnowShowers": "weather-storm",
     "VeryCloudy": "weather-many-clouds",
-}
\ No newline at end of file
+}
+
+# --- PARSED MODEL ---
+# The raw response keeps every number as a string, plus imperial duplicates
+# and icon URLs the shell never shows. It is parsed once into these.
+
+def to_int(value: str) -> int:
+    try: return int(value)
+    except (TypeError, ValueError): return 0
+
+def to_float(value: str) -> float:
+    try: return float(value)
+    except (TypeError, ValueError): return 0.0
+
+def format_time(time_str: str) -> str:
+    """Converts '300' to '03:00'"""
+    return f"{time_str.zfill(4)[:2]}:{time_str.zfill(4)[2:]}"
+
+@dataclass(slots=True, frozen=True)
+class Conditions:
+    temp_c: int
+    feels_like_c: int
+    wind_kmph: int
+    wind_dir: str
+    icon_name: str
+    symbol: str
+
+    @classmethod
+    def parse(cls, data: CurrentCondition) -> "Conditions":
+        kind = WWO_CODE.get(data["weatherCode"])
+        return cls(
+            temp_c=to_int(data["temp_C"]),
+            feels_like_c=to_int(data["FeelsLikeC"]),
+            wind_kmph=to_int(data["windspeedKmph"]),
+            wind_dir=data["winddir16Point"],
+            icon_name=WEATHER_SYMBOL_GTK.get(kind, "weather-clear"), # type: ignore
+            symbol=WEATHER_SYMBOL.get(kind, WEATHER_SYMBOL["Unknown"]), # type: ignore
+        )
+
+@dataclass(slots=True, frozen=True)
+class Hour:
+    time: str
+    temp_c: int
+    chance_of_rain: int
+    chance_of_snow: int
+    icon_name: str
+
+    @classmethod
+    def parse(cls, data: HourlyForecast) -> "Hour":
+        return cls(
+            time=format_time(data["time"]),
+            temp_c=to_int(data["tempC"]),
+            chance_of_rain=to_int(data["chanceofrain"]),
+            chance_of_snow=to_int(data["chanceofsnow"]),
+            icon_name=WEATHER_SYMBOL_GTK.get(WWO_CODE.get(data["weatherCode"]), "weather-clear"), # type: ignore
+        )
+
+@dataclass(slots=True, frozen=True)
+class WeatherReport:
+    current: Conditions
+    hourly: tuple[Hour, ...]
+    moon_phase: str
+    # Highest hourly chance of the day
+    max_rain: int
+    max_snow: int
+    total_snow_cm: float
+
+    @classmethod
+    def parse(cls, data: WttrInResponse) -> "WeatherReport":
+        """Raises KeyError/IndexError on a response that isn't wttr.in's j1 format."""
+        today = data["weather"][0]
+        hourly = tuple(Hour.parse(h) for h in today["hourly"])
+        return cls(
+            current=Conditions.parse(data["current_condition"][0]),
+            hourly=hourly,
+            moon_phase=today["astronomy"][0]["moon_phase"],
+            max_rain=max((h.chance_of_rain for h in hourly), default=0),
+            max_snow=max((h.chance_of_snow for h in hourly), default=0),
+            total_snow_cm=to_float(today["totalSnow_cm"]),
+        )
@@ -0,0 +1,170 @@
+import os
+import glob
+import ctypes
+import struct
+import threading
+from collections.abc import Callable
+from loguru import logger
+from gi.repository import GLib # type: ignore
+
+from src.utils.threads import thread
+from src.utils.uevent import UEVENTS
+
+IN_OPEN = 0x20
+IN_CLOSE_WRITE = 0x08
+IN_CLOSE_NOWRITE = 0x10
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+INOTIFY_EVENT = struct.Struct("iIII")
+# PipeWire opens cameras on behalf of its clients, those are attributed via the graph instead
+PROXY_HOLDERS = ("pipewire", "wireplumber")
+SCAN_DELAY_MS = 150
+
+class CameraWatcher:
+    """
+    Finds processes holding /dev/video* open without polling. inotify
+    reports every open/close of a video node, and only then the holder
+    index is refreshed:
+
+    - the PIDs already known to hold a camera are re-checked, that covers
+      every close and any re-open by a known holder,
+    - opens they don't account for (opens minus closes of the batch, minus
+      the fds known holders gained) are searched for by walking the user's
+      processes from the highest PID down, stopping once they are all
+      found, since the opener is usually a process that was just started.
+
+    Only processes owned by the current user are looked at, other users'
+    fds are not readable anyway.
+    """
+
+    def __init__(self, proc_root: str = "/proc", dev_root: str = "/dev"):
+        self.proc_root = proc_root
+        self.dev_root = dev_root
+        self.uid = os.getuid()
+        # pid -> (start time, name, video nodes it holds, video fds it holds)
+        self.holders: dict[int, tuple[int, str, frozenset[str], int]] = {}
+        self.subscribers: list[Callable[[set[str]], None]] = []
+        self.pending_opens = 0
+        self.pending_closes = 0
+        self.scan_timer = None
+        self._lock = threading.Lock()
+
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            logger.warning(f"[Camera] inotify unavailable: {os.strerror(ctypes.get_errno())}")
+            return
+        self.watches: dict[str, int] = {}
+        self.add_watches()
+        GLib.io_add_watch(self.fd, GLib.PRIORITY_DEFAULT, GLib.IO_IN, self.on_inotify)
+        # Webcams come and go, watch nodes as they are created
+        UEVENTS.subscribe("video4linux", lambda _: self.add_watches())
+        # Something may already be streaming when the shell starts
+        self.pending_opens = len(self.watches)
+        self.schedule_scan()
+
+    def subscribe(self, callback: Callable[[set[str]], None]):
+        """Calls `callback(app_names)` on the GTK thread when the set of camera holders changes."""
+        self.subscribers.append(callback)
+
+    def add_watches(self):
+        for node in glob.glob(f"{self.dev_root}/video*"):
+            if node in self.watches: continue
+            wd = self.libc.inotify_add_watch(self.fd, node.encode(), IN_OPEN | IN_CLOSE_WRITE | IN_CLOSE_NOWRITE)
+            if wd >= 0: self.watches[node] = wd
+        # Removed nodes drop their watch on their own (IN_IGNORED)
+        self.watches = {node: wd for node, wd in self.watches.items() if os.path.exists(node)}
+
+    def on_inotify(self, fd, condition):
+        try:
+            data = os.read(fd, 4096)
+        except BlockingIOError:
+            return True
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            _, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size + length
+            if mask & IN_OPEN: self.pending_opens += 1
+            if mask & (IN_CLOSE_WRITE | IN_CLOSE_NOWRITE): self.pending_closes += 1
+        self.schedule_scan()
+        return True
+
+    def schedule_scan(self):
+        # Apps probe every node on startup, one scan covers the whole burst
+        if self.scan_timer is None:
+            self.scan_timer = GLib.timeout_add(SCAN_DELAY_MS, self.start_scan)
+
+    def start_scan(self):
+        self.scan_timer = None
+        opens, self.pending_opens = self.pending_opens, 0
+        closes, self.pending_closes = self.pending_closes, 0
+        thread(self.scan, opens, closes)
+        return False
+
+    # --- INDEX (thread pool) ---
+    def video_nodes(self, pid: int) -> tuple[frozenset[str], int]:
+        """The video nodes a process holds open, and through how many fds."""
+        fd_dir = f"{self.proc_root}/{pid}/fd"
+        nodes = set()
+        count = 0
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            return frozenset(), 0
+        for fd in fds:
+            try: target = os.readlink(f"{fd_dir}/{fd}")
+            except OSError: continue
+            if target.startswith(f"{self.dev_root}/video"):
+                nodes.add(target)
+                count += 1
+        return frozenset(nodes), count
+
+    def process_info(self, pid: int) -> tuple[int, str] | None:
+        """(start time, name) of a process owned by the user, None otherwise."""
+        try:
+            if os.stat(f"{self.proc_root}/{pid}").st_uid != self.uid: return None
+            with open(f"{self.proc_root}/{pid}/stat", "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        close = data.rfind(b")")
+        fields = data[close + 2:].split(None, 20)
+        if len(fields) < 20: return None
+        return int(fields[19]), data[data.find(b"(") + 1:close].decode(errors="replace")
+
+    def scan(self, opens: int, closes: int):
+        with self._lock:
+            before = self.names()
+            known_before = sum(fds for *_, fds in self.holders.values())
+
+            if opens or closes:
+                # Known holders first, they account for every close and for their own re-opens
+                for pid, (start, name, _, _) in list(self.holders.items()):
+                    info = self.process_info(pid)
+                    nodes, fds = self.video_nodes(pid) if info and info[0] == start else (frozenset(), 0)
+                    if fds: self.holders[pid] = (start, name, nodes, fds)
+                    else: del self.holders[pid]
+
+            # Whatever is left was opened by a process not indexed yet. Opens
+            # closed again before the scan (probes) cancel out against their close.
+            known_after = sum(fds for *_, fds in self.holders.values())
+            missing = opens - closes - (known_after - known_before)
+            if missing > 0:
+                found = 0
+                for pid in sorted((int(p) for p in os.listdir(self.proc_root) if p.isdigit()), reverse=True):
+                    if pid in self.holders: continue
+                    info = self.process_info(pid)
+                    if info is None: continue
+                    nodes, fds = self.video_nodes(pid)
+                    if not fds: continue
+                    self.holders[pid] = (info[0], info[1], nodes, fds)
+                    found += fds
+                    if found >= missing: break
+
+            after = self.names()
+        if after != before:
+            for callback in self.subscribers:
+                GLib.idle_add(callback, after)
+
+    def names(self) -> set[str]:
+        return {name for _, name, _, _ in self.holders.values() if name not in PROXY_HOLDERS}
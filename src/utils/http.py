@@ -0,0 +1,96 @@
+import time
+import random
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+import urllib3
+from loguru import logger
+
+from src.utils.threads import thread
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Exponential backoff with full jitter: uniform in [0, min(cap, base * 2^attempt)]."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+class HttpClient:
+    """
+    Shared HTTP client for the shell. Connections are pooled and kept
+    alive by a single urllib3.PoolManager, failed requests are retried
+    with jittered exponential backoff, and fetch() is single-flight:
+    callers asking for the same request while it is running get the
+    same Future instead of a second request. Everything runs on the
+    shared thread pool.
+    """
+
+    def __init__(self, retries: int = 3, backoff_base: float = 1.0, backoff_cap: float = 30.0):
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.pool = urllib3.PoolManager(
+            num_pools=4,
+            maxsize=2,
+            # Failures are retried here, with jitter, redirects are still followed
+            retries=urllib3.Retry(total=None, connect=0, read=0, status=0, other=0, redirect=3, raise_on_redirect=False),
+            timeout=urllib3.Timeout(connect=5, read=20),
+            headers={"User-Agent": "CNBShell"},
+        )
+        self._lock = threading.Lock()
+        self._inflight: dict[tuple, Future] = {}
+
+    def request(self, method: str, url: str, headers: dict[str, str] | None = None) -> urllib3.BaseHTTPResponse:
+        """Blocking request with retries. Raises the last error once they run out."""
+        attempt = 0
+        while True:
+            try:
+                resp = self.pool.request(method, url, headers=headers)
+                if resp.status not in RETRY_STATUSES or attempt >= self.retries:
+                    return resp
+                delay = self.retry_after(resp) or backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+                logger.debug(f"[HTTP] {method} {url} answered {resp.status}, retrying in {delay:.1f}s")
+            except urllib3.exceptions.HTTPError as e:
+                if attempt >= self.retries: raise
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+                logger.debug(f"[HTTP] {method} {url} failed ({e}), retrying in {delay:.1f}s")
+            attempt += 1
+            time.sleep(delay)
+
+    def retry_after(self, resp: urllib3.BaseHTTPResponse) -> float | None:
+        value = resp.headers.get("Retry-After")
+        if value is None or not value.isdigit(): return None
+        return min(float(value), self.backoff_cap)
+
+    def fetch(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        parse: Callable[[urllib3.BaseHTTPResponse], Any] | None = None,
+    ) -> Future:
+        """
+        Runs the request on the thread pool and returns its Future, resolved
+        with parse(response) (or the response). An identical request that
+        is still in flight is shared rather than sent again.
+        """
+        key = (method, url, tuple(sorted((headers or {}).items())))
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None: return future
+
+            def run():
+                resp = self.request(method, url, headers)
+                return parse(resp) if parse else resp
+
+            future = thread(run)
+            self._inflight[key] = future
+        future.add_done_callback(lambda _: self._forget(key))
+        return future
+
+    def _forget(self, key: tuple):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+# Global Instance
+HTTP = HttpClient()
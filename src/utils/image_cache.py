@@ -0,0 +1,110 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from gi.repository import GLib, GdkPixbuf # type: ignore
+
+THUMBNAIL_SIZE = 42
+
+class ThumbnailCache:
+    """
+    Bounded LRU of ready-to-use thumbnails keyed by a hash of the raw pixels.
+    Chat apps resend the same avatar with every message, so a hit costs one
+    hash instead of a decode and a resize.
+    """
+
+    def __init__(self, max_entries: int = 64, size: int = THUMBNAIL_SIZE):
+        self.max_entries = max_entries
+        self.size = size
+        self._entries: OrderedDict[str, GdkPixbuf.Pixbuf] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> GdkPixbuf.Pixbuf | None:
+        with self._lock:
+            pixbuf = self._entries.get(key)
+            if pixbuf is not None:
+                self._entries.move_to_end(key)
+            return pixbuf
+
+    def put(self, key: str, pixbuf: GdkPixbuf.Pixbuf):
+        with self._lock:
+            self._entries[key] = pixbuf
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def decode_image_data(self, value: GLib.Variant, max_bytes: int) -> tuple[str, GdkPixbuf.Pixbuf] | None:
+        """
+        Turns an (iiibiiay) image-data hint into a (hash, thumbnail) pair.
+        The pixel array is never turned into Python lists or hex. PyGObject has
+        no zero-copy view of GLib.Bytes, so hashing it costs one bytes copy,
+        the pixbuf itself is built from the GLib.Bytes without another.
+        """
+        width = value.get_child_value(0).get_int32()
+        height = value.get_child_value(1).get_int32()
+        rowstride = value.get_child_value(2).get_int32()
+        has_alpha = value.get_child_value(3).get_boolean()
+        bits_per_sample = value.get_child_value(4).get_int32()
+        channels = value.get_child_value(5).get_int32()
+
+        if width <= 0 or height <= 0 or bits_per_sample != 8:
+            return None
+        if channels != (4 if has_alpha else 3):
+            return None
+
+        glib_bytes = value.get_child_value(6).get_data_as_bytes()
+        if glib_bytes.get_size() > max_bytes:
+            return None
+
+        # get_data() returns a copy, this is the one copy made of the pixels
+        raw = glib_bytes.get_data()
+        # The last row doesn't need to be padded up to the full rowstride
+        if len(raw) < rowstride * (height - 1) + width * channels:
+            return None
+
+        digest = hashlib.blake2b(raw, digest_size=16)
+        digest.update(f"{width}x{height}:{rowstride}:{int(has_alpha)}".encode())
+        key = digest.hexdigest()
+
+        cached = self.get(key)
+        if cached is not None:
+            return key, cached
+
+        pixbuf = GdkPixbuf.Pixbuf.new_from_bytes(
+            glib_bytes, GdkPixbuf.Colorspace.RGB, has_alpha, bits_per_sample, width, height, rowstride
+        )
+        thumb = self.scale_to_fit(pixbuf)
+        self.put(key, thumb)
+        return key, thumb
+
+    def load_file(self, path: str, size: int) -> GdkPixbuf.Pixbuf | None:
+        """
+        A file:// notification icon scaled to `size`, decoded once and then
+        served from the LRU. The mtime is part of the key so a rewritten file
+        is picked up.
+        """
+        try: mtime = os.stat(path).st_mtime_ns
+        except OSError: return None
+        key = f"file:{path}:{mtime}:{size}"
+        cached = self.get(key)
+        if cached is not None: return cached
+        try:
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(path, size, size, True)
+        except GLib.Error:
+            return None
+        self.put(key, pixbuf)
+        return pixbuf
+
+    def scale_to_fit(self, pixbuf: GdkPixbuf.Pixbuf) -> GdkPixbuf.Pixbuf:
+        width, height = pixbuf.get_width(), pixbuf.get_height()
+        if width <= self.size and height <= self.size:
+            # new_from_bytes keeps a reference to the D-Bus message buffer,
+            # copy so the message can be freed
+            return pixbuf.copy()
+        scale = self.size / max(width, height)
+        new_width = max(1, round(width * scale))
+        new_height = max(1, round(height * scale))
+        return pixbuf.scale_simple(new_width, new_height, GdkPixbuf.InterpType.HYPER)
+
+# Global Instance
+THUMBNAIL_CACHE = ThumbnailCache()
@@ -0,0 +1,162 @@
+import os
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from loguru import logger
+from gi.repository import GLib, GdkPixbuf # type: ignore
+
+from src.config import SHELL_CONFIG
+from src.utils.image_cache import THUMBNAIL_CACHE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY,
+    app_name TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    body TEXT NOT NULL,
+    icon TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    thumb TEXT,
+    dismissed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_notifications_active ON notifications(dismissed, id);
+CREATE INDEX IF NOT EXISTS idx_notifications_timestamp ON notifications(timestamp);
+"""
+
+COLUMNS = "id, app_name, summary, body, icon, timestamp, thumb"
+
+@dataclass(slots=True)
+class NotificationRecord:
+    id: int
+    app_name: str
+    summary: str
+    body: str
+    icon: str
+    timestamp: float
+    thumb: str | None
+    track_key: str | None = None
+
+    def time_str(self) -> str:
+        stamp = time.localtime(self.timestamp)
+        if stamp[:3] == time.localtime()[:3]:
+            return time.strftime("%H:%M", stamp)
+        return time.strftime("%d %b %H:%M", stamp)
+
+class NotificationHistory:
+    """
+    Persistent notification log backed by SQLite in WAL mode.
+    Rows are written once when a message is finalized and paged back in
+    by id, so nothing has to be replayed on startup.
+    """
+
+    def __init__(self, base_dir: Path | None = None):
+        self.base_dir = base_dir or Path(GLib.get_user_state_dir()) / "cnbshell"
+        self.thumb_dir = self.base_dir / "thumbnails"
+        self.thumb_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # New records are written by a single worker, in arrival order
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history")
+        self._db = sqlite3.connect(self.base_dir / "notifications.db", check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+        # replaces_id values are only meaningful for the daemon's current
+        # lifetime, so replacement tracking is kept per session, in memory
+        self._tracked: dict[str, int] = {}
+
+        self.prune(SHELL_CONFIG.notifications.get("history_days", 30))
+        # Kept in memory so the bar count never needs a table scan
+        self._active_count = self._db.execute("SELECT COUNT(*) FROM notifications WHERE dismissed = 0").fetchone()[0]
+
+    def record(self, app_name, summary, body, icon, track_key=None, image_key=None, image=None) -> NotificationRecord:
+        """Stores a finalized message. Replacements move the entry to the top."""
+        thumb = self.save_thumbnail(image_key, image) if image_key else None
+        now = time.time()
+
+        with self._lock, self._db:
+            previous = self._tracked.get(track_key) if track_key else None
+            if previous is not None:
+                deleted = self._db.execute("DELETE FROM notifications WHERE id = ? AND dismissed = 0", (previous,))
+                self._active_count -= deleted.rowcount
+            cursor = self._db.execute(
+                "INSERT INTO notifications (app_name, summary, body, icon, timestamp, thumb) VALUES (?, ?, ?, ?, ?, ?)",
+                (app_name, summary, body, icon, now, thumb)
+            )
+            record_id = cursor.lastrowid
+            self._active_count += 1
+            if track_key: self._tracked[track_key] = record_id # type: ignore
+
+        return NotificationRecord(record_id, app_name, summary, body, icon, now, thumb, track_key) # type: ignore
+
+    def record_async(self, *args) -> Future:
+        """record() on the writer thread, the Future resolves to the stored record."""
+        return self._writer.submit(self.record, *args)
+
+    def page(self, before_id: int | None = None, limit: int = 25) -> list[NotificationRecord]:
+        """Returns up to `limit` undismissed records older than `before_id`, newest first."""
+        with self._lock:
+            if before_id is None:
+                rows = self._db.execute(
+                    f"SELECT {COLUMNS} FROM notifications WHERE dismissed = 0 ORDER BY id DESC LIMIT ?", (limit,)
+                ).fetchall()
+            else:
+                rows = self._db.execute(
+                    f"SELECT {COLUMNS} FROM notifications WHERE dismissed = 0 AND id < ? ORDER BY id DESC LIMIT ?",
+                    (before_id, limit)
+                ).fetchall()
+        return [NotificationRecord(*row) for row in rows]
+
+    def count(self) -> int:
+        return self._active_count
+
+    def dismiss(self, record_id: int):
+        with self._lock, self._db:
+            updated = self._db.execute("UPDATE notifications SET dismissed = 1 WHERE id = ? AND dismissed = 0", (record_id,))
+            self._active_count -= updated.rowcount
+            self._tracked = {k: v for k, v in self._tracked.items() if v != record_id}
+
+    def dismiss_all(self):
+        with self._lock, self._db:
+            self._db.execute("UPDATE notifications SET dismissed = 1 WHERE dismissed = 0")
+            self._active_count = 0
+            self._tracked.clear()
+
+    def prune(self, days: int):
+        """Drops records older than `days` and thumbnails nothing refers to anymore."""
+        cutoff = time.time() - days * 86400
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM notifications WHERE timestamp < ?", (cutoff,))
+            referenced = {row[0] for row in self._db.execute("SELECT DISTINCT thumb FROM notifications WHERE thumb IS NOT NULL")}
+
+        for entry in os.scandir(self.thumb_dir):
+            if entry.name.removesuffix(".png") not in referenced:
+                try: os.unlink(entry.path)
+                except OSError: pass
+
+    # --- THUMBNAILS ---
+    def save_thumbnail(self, key: str, pixbuf: GdkPixbuf.Pixbuf | None) -> str | None:
+        path = self.thumb_dir / f"{key}.png"
+        if path.exists(): return key
+        if pixbuf is None: return None
+        try:
+            pixbuf.savev(str(path), "png", [], [])
+            return key
+        except GLib.Error as e:
+            logger.warning(f"[History] Could not save thumbnail: {e.message}")
+            return None
+
+    def load_thumbnail(self, key: str | None) -> GdkPixbuf.Pixbuf | None:
+        if not key: return None
+        pixbuf = THUMBNAIL_CACHE.get(key)
+        if pixbuf is not None: return pixbuf
+        try:
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file(str(self.thumb_dir / f"{key}.png"))
+        except GLib.Error:
+            return None
+        THUMBNAIL_CACHE.put(key, pixbuf)
+        return pixbuf
@@ -0,0 +1,164 @@
+import codecs
+import json
+import os
+import subprocess
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from loguru import logger
+from gi.repository import GLib # type: ignore
+
+from src.utils.threads import run_as_daemon
+
+CAPTURE_CLASSES = ("Stream/Input/Audio", "Stream/Input/Video")
+# Recording clients that are not a privacy concern
+IGNORED_APPS = ("pavucontrol", "WirePlumber", "PipeWire", "cava")
+# Video sources backed by a real camera, anything else feeding a video stream is a screencast
+CAMERA_APIS = ("v4l2", "libcamera")
+RESTART_DELAY = 5
+
+@dataclass(slots=True, frozen=True)
+class CaptureStream:
+    id: int
+    media_class: str
+    app_name: str
+    binary: str
+    pid: int | None
+    camera: bool = False
+
+    @property
+    def is_audio(self) -> bool:
+        return self.media_class == "Stream/Input/Audio"
+
+class PipeWireWatcher:
+    """
+    Keeps an index of PipeWire capture streams from a single long-running
+    `pw-dump --monitor`. The first dump is the whole graph, after that
+    PipeWire only sends the objects that were added, changed or removed
+    (removed ones come as {"id": N, "info": null}), so nothing runs while
+    the graph is idle. Camera sources and links are indexed too, a video
+    stream linked to a camera source is a webcam, otherwise a screencast.
+    """
+
+    def __init__(self):
+        self.streams: dict[int, CaptureStream] = {}
+        self.camera_sources: set[int] = set()
+        self.links: dict[int, tuple[int, int]] = {}
+        self.subscribers: list[Callable[[dict[int, CaptureStream]], None]] = []
+        self.started = False
+
+    def subscribe(self, callback: Callable[[dict[int, CaptureStream]], None]):
+        """Calls `callback(streams)` on the GTK thread whenever the capture streams change."""
+        self.subscribers.append(callback)
+        if not self.started:
+            self.started = True
+            self.run()
+
+    @run_as_daemon
+    def run(self):
+        while True:
+            try:
+                proc = subprocess.Popen(["pw-dump", "--monitor"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            except FileNotFoundError:
+                logger.warning("[PipeWire] pw-dump not found, privacy indicator disabled")
+                return
+
+            self.consume(proc.stdout.fileno()) # type: ignore
+            proc.wait()
+            # PipeWire restarted (or the session is shutting down), forget the old graph
+            self.camera_sources, self.links = set(), {}
+            if self.streams:
+                self.streams = {}
+                self.publish()
+            logger.debug(f"[PipeWire] pw-dump exited with {proc.returncode}, restarting")
+            time.sleep(RESTART_DELAY)
+
+    def consume(self, fd: int):
+        decoder = json.JSONDecoder()
+        # Reads can split a multi-byte character, carry the partial bytes over
+        utf8 = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        buffer = ""
+        while chunk := os.read(fd, 65536):
+            buffer += utf8.decode(chunk)
+            # Every update is a top-level array that ends with "]" on its own line,
+            # don't try to decode before one is complete
+            if "\n]" not in buffer: continue
+
+            changed = False
+            while True:
+                buffer = buffer.lstrip()
+                if not buffer: break
+                try:
+                    objects, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    break
+                buffer = buffer[end:]
+                for obj in objects:
+                    changed = self.apply(obj) or changed
+            if changed: self.publish()
+
+    def apply(self, obj: dict) -> bool:
+        """Updates the index from one object of the dump. Returns whether it changed."""
+        obj_id = obj.get("id")
+        info = obj.get("info")
+        if info is None:
+            link = self.links.pop(obj_id, None) # type: ignore
+            if link is not None: return link[1] in self.streams
+            if obj_id in self.camera_sources:
+                self.camera_sources.discard(obj_id) # type: ignore
+                return True
+            return self.streams.pop(obj_id, None) is not None # type: ignore
+
+        if obj.get("type") == "PipeWire:Interface:Link":
+            source, sink = info.get("output-node-id"), info.get("input-node-id")
+            if source is None or sink is None: return False
+            if self.links.get(obj_id) == (source, sink): return False # type: ignore
+            self.links[obj_id] = (source, sink) # type: ignore
+            return sink in self.streams
+        if obj.get("type") != "PipeWire:Interface:Node": return False
+
+        props = info.get("props")
+        if props is None: return False # Change without props, e.g. a state update
+        if props.get("media.class") == "Video/Source" and props.get("device.api") in CAMERA_APIS:
+            if obj_id in self.camera_sources: return False
+            self.camera_sources.add(obj_id) # type: ignore
+            return True
+        stream = self.to_stream(obj_id, props) # type: ignore
+
+        if stream is None:
+            return self.streams.pop(obj_id, None) is not None # type: ignore
+        if self.streams.get(obj_id) == stream: return False # type: ignore
+        self.streams[obj_id] = stream # type: ignore
+        return True
+
+    @staticmethod
+    def to_stream(obj_id: int, props: dict) -> CaptureStream | None:
+        media_class = props.get("media.class", "")
+        if media_class not in CAPTURE_CLASSES: return None
+
+        # check these keys in order until we find a non-empty string
+        app_name = (
+            props.get("application.name") or
+            props.get("node.description") or
+            props.get("node.nick") or
+            props.get("media.name") or
+            "Unknown Application"
+        )
+        if app_name in IGNORED_APPS: return None
+
+        pid = props.get("application.process.id")
+        try: pid = int(pid) if pid is not None else None
+        except (TypeError, ValueError): pid = None
+        return CaptureStream(obj_id, media_class, app_name, props.get("application.process.binary", ""), pid)
+
+    def publish(self):
+        fed_by_camera = {sink for source, sink in self.links.values() if source in self.camera_sources}
+        streams = {
+            stream_id: replace(stream, camera=True) if not stream.is_audio and stream_id in fed_by_camera else stream
+            for stream_id, stream in self.streams.items()
+        }
+        for callback in self.subscribers:
+            GLib.idle_add(callback, streams)
+
+# Global Instance
+PIPEWIRE = PipeWireWatcher()
@@ -0,0 +1,172 @@
+import os
+import mmap
+import time
+import atexit
+import struct
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from loguru import logger
+from gi.repository import GLib # type: ignore
+
+from src.config import SHELL_CONFIG
+
+MAGIC = b"CNBPRIV1"
+# Header: magic + record count. Record: unix time, name id, kind, event
+HEADER = struct.Struct("<8sQ")
+RECORD = struct.Struct("<dIBB2x")
+GROW_RECORDS = 4096
+
+KIND_MIC = 0
+KIND_SCREEN = 1
+KIND_CAMERA = 2
+KIND_NAMES = {KIND_MIC: "Microphone", KIND_SCREEN: "Screen", KIND_CAMERA: "Camera"}
+
+EVENT_STOP = 0
+EVENT_START = 1
+
+@dataclass(slots=True)
+class AppUsage:
+    """One app's use of a capture device over a queried period."""
+    name: str
+    sessions: int = 0
+    seconds: float = 0.0
+    last_used: float = 0.0
+    active: bool = False
+    _started: float | None = field(default=None, repr=False)
+
+class PrivacyLog:
+    """
+    Append-only log of capture starts and stops. Each event is a 16 byte
+    record in a memory-mapped file, app names are interned once in a
+    side table, so writing is a struct.pack_into and months of use stay
+    in the tens of kilobytes. Records are in time order, queries bisect
+    to their start and unpack the rest straight from the mapping.
+    """
+
+    def __init__(self, base_dir: Path | None = None):
+        self.base_dir = base_dir or Path(GLib.get_user_state_dir()) / "cnbshell"
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        # --- STRING TABLE ---
+        self.names_path = self.base_dir / "privacy.names"
+        self.names: list[str] = []
+        if self.names_path.exists():
+            self.names = self.names_path.read_text(errors="replace").split("\n")[:-1]
+        self.name_ids = {name: i for i, name in enumerate(self.names)}
+        self._names_file = open(self.names_path, "a")
+
+        # --- RECORDS ---
+        path = self.base_dir / "privacy.log"
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o600)
+        if os.fstat(self.fd).st_size < HEADER.size:
+            os.ftruncate(self.fd, HEADER.size + RECORD.size * GROW_RECORDS)
+        self.mm = mmap.mmap(self.fd, 0)
+
+        magic, self.count = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            if magic.strip(b"\0"): logger.warning("[Privacy] Unknown log format, starting a new log")
+            self.count = 0
+            HEADER.pack_into(self.mm, 0, MAGIC, 0)
+        self.count = min(self.count, (len(self.mm) - HEADER.size) // RECORD.size)
+
+        # Apps currently holding each kind of device, to turn states into start/stop events
+        self.active: dict[int, set[str]] = {}
+
+        self.prune(SHELL_CONFIG.privacy.get("log_days", 90))
+        atexit.register(self.close)
+
+    # --- WRITING ---
+    def intern(self, name: str) -> int:
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self.names.append(name)
+            self.name_ids[name] = name_id
+            self._names_file.write(name + "\n")
+            self._names_file.flush()
+        return name_id
+
+    def append(self, kind: int, event: int, name: str, timestamp: float | None = None):
+        with self._lock:
+            offset = HEADER.size + self.count * RECORD.size
+            if offset + RECORD.size > len(self.mm):
+                self.mm.resize(len(self.mm) + RECORD.size * GROW_RECORDS)
+            RECORD.pack_into(self.mm, offset, time.time() if timestamp is None else timestamp,
+                             self.intern(name.replace("\n", " ")), kind, event)
+            # The count is published last, a torn write is never read back
+            self.count += 1
+            HEADER.pack_into(self.mm, 0, MAGIC, self.count)
+
+    def update(self, kind: int, apps: set[str]):
+        """Records starts and stops from the set of apps currently using `kind`."""
+        previous = self.active.get(kind, set())
+        now = time.time()
+        for name in apps - previous: self.append(kind, EVENT_START, name, now)
+        for name in previous - apps: self.append(kind, EVENT_STOP, name, now)
+        self.active[kind] = set(apps)
+
+    def close(self):
+        # Sessions still open when the shell exits end now
+        for kind, apps in list(self.active.items()): self.update(kind, set())
+        with self._lock:
+            self.mm.flush()
+
+    # --- READING ---
+    def timestamp_at(self, index: int) -> float:
+        return RECORD.unpack_from(self.mm, HEADER.size + index * RECORD.size)[0]
+
+    def first_since(self, since: float) -> int:
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamp_at(mid) < since: lo = mid + 1
+            else: hi = mid
+        return lo
+
+    def usage_since(self, since: float) -> dict[int, list[AppUsage]]:
+        """Per kind, the apps that used it since `since`, most recently used first."""
+        result: dict[int, dict[str, AppUsage]] = {}
+        with self._lock:
+            start = self.first_since(since)
+            view = memoryview(self.mm)[HEADER.size + start * RECORD.size:HEADER.size + self.count * RECORD.size]
+            for timestamp, name_id, kind, event in RECORD.iter_unpack(view):
+                name = self.names[name_id] if name_id < len(self.names) else "Unknown Application"
+                app = result.setdefault(kind, {}).setdefault(name, AppUsage(name))
+                app.last_used = timestamp
+                if event == EVENT_START:
+                    app.sessions += 1
+                    app._started = timestamp
+                elif app._started is not None:
+                    app.seconds += timestamp - app._started
+                    app._started = None
+            view.release()
+
+        now = time.time()
+        for kind, apps in result.items():
+            for app in apps.values():
+                app.active = app.name in self.active.get(kind, ())
+                # Only a session that is still running counts up to now, a start
+                # without a stop from a crashed session has no known length
+                if app.active and app._started is not None:
+                    app.seconds += now - app._started
+                    app.last_used = now
+        return {kind: sorted(apps.values(), key=lambda a: a.last_used, reverse=True) for kind, apps in result.items()}
+
+    # --- MAINTENANCE ---
+    def prune(self, days: int):
+        """Drops records older than `days` by moving the rest to the front."""
+        if not isinstance(days, (int, float)) or days <= 0: return
+        with self._lock:
+            keep_from = self.first_since(time.time() - days * 86400)
+            if keep_from == 0: return
+            start = HEADER.size + keep_from * RECORD.size
+            end = HEADER.size + self.count * RECORD.size
+            self.mm.move(HEADER.size, start, end - start)
+            self.count -= keep_from
+            HEADER.pack_into(self.mm, 0, MAGIC, self.count)
+            logger.info(f"[Privacy] Pruned {keep_from} log records older than {days} days")
+
+# Global Instance
+PRIVACY_LOG = PrivacyLog()
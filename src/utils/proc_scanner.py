@@ -0,0 +1,111 @@
+import os
+import time
+import heapq
+from dataclasses import dataclass
+
+@dataclass(slots=True)
+class ProcEntry:
+    start_time: int
+    name: str
+    ticks: int
+    rss_pages: int
+    cpu_delta: int = 0
+
+@dataclass(slots=True, frozen=True)
+class ProcUsage:
+    pid: int
+    name: str
+    cpu_percent: float
+    rss: int
+
+class ProcessScanner:
+    """
+    Incremental /proc/<pid>/stat scanner. Per-PID state survives between
+    scans and is keyed by start time, so a process is only resolved (name,
+    command line) once and PID reuse is detected. Each scan only reads one
+    stat file per process and diffs CPU ticks against the last scan.
+    """
+
+    def __init__(self, proc_root: str = "/proc"):
+        self.proc_root = proc_root
+        self.table: dict[int, ProcEntry] = {}
+        self.clock_ticks = os.sysconf("SC_CLK_TCK")
+        self.page_size = os.sysconf("SC_PAGE_SIZE")
+        self.elapsed = 0.0
+        self._last_scan: float | None = None
+
+    def read_stat(self, pid: int) -> bytes | None:
+        try:
+            fd = os.open(f"{self.proc_root}/{pid}/stat", os.O_RDONLY | os.O_CLOEXEC)
+        except OSError:
+            return None
+        try:
+            return os.read(fd, 1024)
+        except OSError:
+            return None
+        finally:
+            os.close(fd)
+
+    def resolve_name(self, pid: int, comm: str) -> str:
+        # comm is truncated to 15 chars, the first argv entry usually isn't
+        try:
+            with open(f"{self.proc_root}/{pid}/cmdline", "rb") as f:
+                argv0 = f.read(512).split(b"\0", 1)[0]
+        except OSError:
+            return comm
+        name = os.path.basename(argv0.decode(errors="replace"))
+        return name if name.startswith(comm[:15]) else comm
+
+    def scan(self, max_gap: float | None = None) -> bool:
+        """
+        Refreshes the table. A first scan, or one more than `max_gap` seconds
+        after the last, only records a new baseline: deltas over a long gap
+        would rank by old usage. Returns whether the deltas are meaningful.
+        """
+        now = time.monotonic()
+        gap = now - self._last_scan if self._last_scan else None
+        baseline = gap is None or (max_gap is not None and gap > max_gap)
+        self.elapsed = 0.0 if baseline else gap # type: ignore
+        self._last_scan = now
+
+        alive = set()
+        for entry in os.scandir(self.proc_root):
+            if not entry.name.isdigit(): continue
+            pid = int(entry.name)
+            data = self.read_stat(pid)
+            if not data: continue
+
+            # comm may contain spaces and parentheses, split after the last ')'
+            close = data.rfind(b")")
+            fields = data[close + 2:].split(None, 22)
+            if len(fields) < 22: continue
+            ticks = int(fields[11]) + int(fields[12])
+            start_time = int(fields[19])
+            rss_pages = int(fields[21])
+            alive.add(pid)
+
+            known = self.table.get(pid)
+            if known is None or known.start_time != start_time:
+                comm = data[data.find(b"(") + 1:close].decode(errors="replace")
+                self.table[pid] = ProcEntry(start_time, self.resolve_name(pid, comm), ticks, rss_pages)
+                continue
+
+            known.cpu_delta = 0 if baseline else ticks - known.ticks
+            known.ticks = ticks
+            known.rss_pages = rss_pages
+
+        for pid in self.table.keys() - alive:
+            del self.table[pid]
+        return not baseline
+
+    def usage(self, pid: int, entry: ProcEntry) -> ProcUsage:
+        cpu = entry.cpu_delta / self.clock_ticks / self.elapsed * 100 if self.elapsed else 0.0
+        return ProcUsage(pid, entry.name, round(cpu, 1), entry.rss_pages * self.page_size)
+
+    def top_cpu(self, n: int = 5) -> list[ProcUsage]:
+        best = heapq.nlargest(n, self.table.items(), key=lambda item: item[1].cpu_delta)
+        return [self.usage(pid, entry) for pid, entry in best if entry.cpu_delta > 0]
+
+    def top_memory(self, n: int = 5) -> list[ProcUsage]:
+        best = heapq.nlargest(n, self.table.items(), key=lambda item: item[1].rss_pages)
+        return [self.usage(pid, entry) for pid, entry in best]
@@ -0,0 +1,77 @@
+import os
+import time
+from collections.abc import Callable
+from loguru import logger
+from gi.repository import GLib # type: ignore
+
+from src.utils.sysmon_engine import ProcFile
+
+# "some" stall time (us) within a window (us) that fires a trigger. Windows
+# are a multiple of 2s, which is what the kernel requires from unprivileged users
+PSI_TRIGGERS = {
+    "cpu": "some 200000 2000000",
+    "memory": "some 100000 2000000",
+    "io": "some 200000 2000000",
+}
+# How long a resource counts as stalled after its last trigger
+STALL_HOLD = 3.0
+
+class PressureMonitor:
+    """
+    Registers kernel PSI triggers on /proc/pressure/* and waits for them
+    with a GLib IO watch. The kernel wakes us with POLLPRI only when the
+    stall threshold is crossed, so there is no polling in between.
+    """
+
+    def __init__(self, triggers: dict[str, str] = PSI_TRIGGERS, proc_root: str = "/proc"):
+        self.files: dict[str, ProcFile] = {}
+        self.last_stall: dict[str, float] = {}
+        self.callbacks: list[Callable[[str], None]] = []
+
+        for resource, trigger in triggers.items():
+            path = f"{proc_root}/pressure/{resource}"
+            try:
+                psi = ProcFile(path, 256, os.O_RDWR | os.O_NONBLOCK)
+            except OSError as e:
+                logger.debug(f"[PSI] {path} unavailable: {e}")
+                continue
+            try:
+                os.write(psi.fd, trigger.encode() + b"\0")
+            except OSError as e:
+                # Kernels before 6.5 only allow triggers with CAP_SYS_RESOURCE
+                logger.warning(f"[PSI] Could not register trigger on {path}: {e}")
+                psi.close()
+                continue
+            self.files[resource] = psi
+            GLib.io_add_watch(psi.fd, GLib.PRIORITY_DEFAULT, GLib.IO_PRI | GLib.IO_ERR, self.on_event, resource)
+
+    def subscribe(self, callback: Callable[[str], None]):
+        """Calls `callback(resource)` on the GTK thread whenever a trigger fires."""
+        self.callbacks.append(callback)
+
+    def on_event(self, fd, condition, resource):
+        if condition & GLib.IO_ERR:
+            # The pressure file went away, nothing will fire again
+            logger.warning(f"[PSI] Trigger on {resource} failed, stopped watching it")
+            self.files.pop(resource).close()
+            return False
+
+        self.last_stall[resource] = time.monotonic()
+        for callback in self.callbacks:
+            try: callback(resource)
+            except Exception as e: logger.exception(f"[PSI] Subscriber failed: {e}")
+        return True
+
+    def stalled(self, resource: str) -> bool:
+        last = self.last_stall.get(resource)
+        return last is not None and time.monotonic() - last < STALL_HOLD
+
+    def avg10(self, resource: str) -> float | None:
+        """Share of the last 10s some task was stalled on `resource`, in percent."""
+        psi = self.files.get(resource)
+        if psi is None: return None
+        try:
+            line = psi.read().split(b"\n", 1)[0]
+            return float(line.split()[1].partition(b"=")[2])
+        except (OSError, ValueError, IndexError):
+            return None
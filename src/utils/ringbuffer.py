@@ -0,0 +1,66 @@
+import math
+import time
+from array import array
+
+class RingBuffer:
+    """
+    Fixed-capacity time series backed by preallocated array('d')/array('f').
+    Appends are O(1) and never allocate; window statistics run over the
+    underlying C arrays without copying them.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.times = array('d', bytes(8 * self.capacity))
+        self.values = array('f', bytes(4 * self.capacity))
+        self.head = 0 # next write position
+        self.size = 0
+
+    def append(self, value: float, timestamp: float | None = None):
+        self.times[self.head] = time.monotonic() if timestamp is None else timestamp
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        if self.size < self.capacity: self.size += 1
+
+    def last(self) -> float | None:
+        if not self.size: return None
+        return self.values[self.head - 1]
+
+    def _segments(self, count: int) -> list[memoryview]:
+        """The newest `count` values as at most two zero-copy views, oldest first."""
+        count = min(count, self.size)
+        if count <= 0: return []
+        view = memoryview(self.values)
+        start = self.head - count
+        if start >= 0: return [view[start:self.head]]
+        return [view[start + self.capacity:], view[:self.head]]
+
+    def count_since(self, seconds: float) -> int:
+        """How many of the newest samples are younger than `seconds`."""
+        cutoff = time.monotonic() - seconds
+        # Timestamps are monotonic, binary search from the newest backwards
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.times[(self.head - 1 - mid) % self.capacity] >= cutoff: lo = mid + 1
+            else: hi = mid
+        return lo
+
+    def window(self, count: int) -> array:
+        """Copy of the newest `count` values, oldest first. Only used for drawing."""
+        result = array('f')
+        for segment in self._segments(count): result.frombytes(segment.tobytes())
+        return result
+
+    def min(self, count: int) -> float:
+        segments = self._segments(count)
+        return min(min(s) for s in segments) if segments else math.nan
+
+    def max(self, count: int) -> float:
+        segments = self._segments(count)
+        return max(max(s) for s in segments) if segments else math.nan
+
+    def avg(self, count: int) -> float:
+        segments = self._segments(count)
+        total = sum(len(s) for s in segments)
+        return sum(math.fsum(s) for s in segments) / total if total else math.nan
@@ -0,0 +1,394 @@
+import os
+import time
+from dataclasses import dataclass, field
+from loguru import logger
+
+# Priority list for CPU temperature chips (hwmon "name") on Linux
+PRIORITY_TEMP_CHIPS = ["coretemp", "k10temp", "zenpower", "cpu_thermal", "thinkpad", "acpitz"]
+# Labels of the sensor that reports the whole package/die
+PACKAGE_LABELS = ("package id", "tctl", "tdie", "cpu")
+# Chips that expose the CPU fan, Asus laptops use asus-nb-wmi (older kernels: asus)
+PRIORITY_FAN_CHIPS = ["asus-nb-wmi", "asus", "thinkpad", "dell_smm"]
+# diskstats always counts 512-byte sectors, whatever the device's block size
+SECTOR_SIZE = 512
+
+class ProcFile:
+    """
+    A procfs/sysfs file that is opened once and re-read with preadv into a
+    reusable buffer. The buffer only grows if the file outgrows it.
+    """
+
+    def __init__(self, path: str, size: int = 4096, flags: int = os.O_RDONLY):
+        self.path = path
+        self.fd = os.open(path, flags | os.O_CLOEXEC)
+        self.buf = bytearray(size)
+
+    def read(self) -> bytes:
+        while True:
+            n = os.preadv(self.fd, [self.buf], 0)
+            if n < len(self.buf):
+                return bytes(memoryview(self.buf)[:n])
+            self.buf = bytearray(len(self.buf) * 2)
+
+    def read_int(self) -> int:
+        n = os.preadv(self.fd, [self.buf], 0)
+        return int(self.buf[:n])
+
+    def close(self):
+        try: os.close(self.fd)
+        except OSError: pass
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+class SensorRegistry:
+    """
+    Resolves the CPU temperature and fan inputs once and keeps them open.
+    A rescan only happens after invalidate(), which is wired to hwmon
+    add/remove uevents, so steady-state sampling never touches the
+    directory tree.
+    """
+
+    def __init__(self, sys_root: str = "/sys"):
+        self.sys_root = sys_root
+        self.temps: list[tuple[str, ProcFile]] = []
+        self.fans: list[tuple[str, ProcFile]] = []
+        self.dirty = True
+
+    def invalidate(self, *_):
+        # Only flags the registry, the sampling thread rescans on its next tick
+        self.dirty = True
+
+    def ensure(self):
+        if self.dirty:
+            self.dirty = False
+            self.scan()
+
+    def scan(self):
+        for _, sensor in self.temps + self.fans: sensor.close()
+        self.temps, self.fans = [], []
+
+        base = f"{self.sys_root}/class/hwmon"
+        chips = {}
+        try:
+            entries = sorted(os.listdir(base))
+        except OSError:
+            entries = []
+
+        for entry in entries:
+            path = f"{base}/{entry}"
+            name = _read_text(f"{path}/name") or entry
+            try: files = os.listdir(path)
+            except OSError: continue
+            temps = sorted(f for f in files if f.startswith("temp") and f.endswith("_input"))
+            fans = sorted(f for f in files if f.startswith("fan") and f.endswith("_input"))
+            chips.setdefault(name, (path, temps, fans))
+
+        # CPU temperature: first chip from the priority list, else the first with any input
+        temp_chip = next((k for k in PRIORITY_TEMP_CHIPS if k in chips and chips[k][1]), None)
+        if temp_chip is None:
+            temp_chip = next((k for k, v in chips.items() if v[1]), None)
+        if temp_chip is not None:
+            path, temps, _ = chips[temp_chip]
+            self.temps = self.open_inputs(path, temps, "Sensor")
+            # The package sensor goes first, it is what the bar shows
+            self.temps.sort(key=lambda item: not item[0].lower().startswith(PACKAGE_LABELS))
+
+        fan_chips = [k for k in PRIORITY_FAN_CHIPS if k in chips] + [k for k in chips if k not in PRIORITY_FAN_CHIPS]
+        for name in fan_chips:
+            path, _, fans = chips[name]
+            self.fans.extend(self.open_inputs(path, fans, name))
+        # Whatever is labelled as the CPU fan wins over chip priority
+        self.fans.sort(key=lambda item: "cpu" not in item[0].lower())
+
+        logger.info(f"[Sysmon] Sensors: temperature from {temp_chip or 'nothing'}, {len(self.fans)} fan input(s)")
+        if not self.fans:
+            logger.warning("[Sysmon] No fan found. Will always return zero")
+
+    def open_inputs(self, path: str, inputs: list[str], default_label: str) -> list[tuple[str, ProcFile]]:
+        opened = []
+        for name in inputs:
+            label = _read_text(f"{path}/{name.removesuffix('_input')}_label") or default_label
+            try:
+                opened.append((label, ProcFile(f"{path}/{name}", 32)))
+            except OSError:
+                continue
+        return opened
+
+class CpuTelemetry:
+    """
+    Per-core frequency, package thermal throttle counters and the ACPI
+    platform profile, opened once like the hwmon inputs. Every file is
+    optional: AMD has no thermal_throttle, VMs have no cpufreq.
+    """
+
+    def __init__(self, sys_root: str = "/sys"):
+        cpu_root = f"{sys_root}/devices/system/cpu"
+        self.freqs: list[ProcFile] = []
+        self.throttle: list[ProcFile] = []
+        self.profile: ProcFile | None = None
+
+        try:
+            cpus = sorted((e for e in os.listdir(cpu_root) if e[3:].isdigit()), key=lambda e: int(e[3:]))
+        except OSError:
+            cpus = []
+
+        packages = set()
+        for cpu in cpus:
+            path = f"{cpu_root}/{cpu}"
+            try: self.freqs.append(ProcFile(f"{path}/cpufreq/scaling_cur_freq", 32))
+            except OSError: pass
+            # package_throttle_count is the same on every core of a package, keep one per package
+            package = _read_text(f"{path}/topology/physical_package_id")
+            if package in packages: continue
+            try:
+                self.throttle.append(ProcFile(f"{path}/thermal_throttle/package_throttle_count", 32))
+                packages.add(package)
+            except OSError: pass
+
+        try: self.profile = ProcFile(f"{sys_root}/firmware/acpi/platform_profile", 64)
+        except OSError: pass
+
+        self._prev_throttle = self.read_throttle_total()
+
+    def read_freqs(self) -> list[int]:
+        """Current frequency per core in MHz."""
+        freqs = []
+        for f in self.freqs:
+            try: freqs.append(f.read_int() // 1000)
+            except (OSError, ValueError): continue
+        return freqs
+
+    def read_throttle_total(self) -> int:
+        total = 0
+        for f in self.throttle:
+            try: total += f.read_int()
+            except (OSError, ValueError): continue
+        return total
+
+    def read_throttle(self) -> tuple[int, int]:
+        """(events since the last call, events since boot) over all packages."""
+        total = self.read_throttle_total()
+        events = max(total - self._prev_throttle, 0)
+        self._prev_throttle = total
+        return events, total
+
+    def read_profile(self) -> str | None:
+        if self.profile is None: return None
+        try: return self.profile.read().decode().strip()
+        except OSError: return None
+
+@dataclass(slots=True)
+class Snapshot:
+    """One sampling tick, published as a whole to the UI."""
+    cpu_percent: list[float] = field(default_factory=list)
+    cpu_avg: float = 0.0
+    mem_total: int = 0
+    mem_used: int = 0
+    mem_free: int = 0
+    mem_percent: float = 0.0
+    swap_total: int = 0
+    swap_used: int = 0
+    swap_free: int = 0
+    swap_percent: float = 0.0
+    temps: list[tuple[str, int]] = field(default_factory=list)
+    temp: int | None = None
+    fan_rpm: int = 0
+    # Throughput in bytes/s, per device and summed
+    net: list[tuple[str, float, float]] = field(default_factory=list)
+    net_rx: float = 0.0
+    net_tx: float = 0.0
+    disks: list[tuple[str, float, float]] = field(default_factory=list)
+    disk_read: float = 0.0
+    disk_write: float = 0.0
+    # CPU telemetry, MHz per core, throttle events since the last tick/since boot
+    cpu_freqs: list[int] = field(default_factory=list)
+    throttle_events: int = 0
+    throttle_total: int = 0
+    platform_profile: str | None = None
+
+class SysmonEngine:
+    """
+    Reads /proc/stat, /proc/meminfo, /proc/net/dev, /proc/diskstats, the
+    registry's hwmon inputs and CPU telemetry from descriptors that are
+    discovered and opened once. proc_root/sys_root can point at a fake tree for benchmarking.
+    """
+
+    def __init__(self, proc_root: str = "/proc", sys_root: str = "/sys"):
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+
+        self.stat = ProcFile(f"{proc_root}/stat")
+        self.meminfo = ProcFile(f"{proc_root}/meminfo")
+        self.netdev = ProcFile(f"{proc_root}/net/dev")
+        self.diskstats = ProcFile(f"{proc_root}/diskstats", 16384)
+        self.sensors = SensorRegistry(sys_root)
+        self.sensors.ensure()
+        self.cpu = CpuTelemetry(sys_root)
+
+        self._prev_cpu: list[tuple[int, int]] = self.read_cpu_times()
+
+        # Whether a device is physical, decided once per name
+        self._physical: dict[str, bool] = {}
+        self._prev_time = time.monotonic()
+        self._prev_net = self.read_net_bytes()
+        self._prev_disk = self.read_disk_bytes()
+
+    def is_physical(self, kind: str, name: str) -> bool:
+        """Loopback, bridges, veth, loop, zram and device-mapper all live under devices/virtual."""
+        key = f"{kind}/{name}"
+        known = self._physical.get(key)
+        if known is None:
+            known = not os.path.exists(f"{self.sys_root}/devices/virtual/{key}")
+            if kind == "block": known = known and os.path.exists(f"{self.sys_root}/block/{name}")
+            self._physical[key] = known
+        return known
+
+    # --- SAMPLING ---
+    def read_cpu_times(self) -> list[tuple[int, int]]:
+        """(busy, total) jiffies per core, guest time excluded as it is already in user/nice."""
+        times = []
+        for line in self.stat.read().split(b"\n"):
+            if not line.startswith(b"cpu"): break
+            if line.startswith(b"cpu "): continue
+            fields = [int(x) for x in line.split()[1:]]
+            total = sum(fields[:8])
+            idle = fields[3] + fields[4]
+            times.append((total - idle, total))
+        return times
+
+    def read_net_bytes(self) -> dict[str, tuple[int, int]]:
+        """(rx, tx) byte counters per physical interface."""
+        counters = {}
+        for line in self.netdev.read().split(b"\n")[2:]:
+            name, sep, rest = line.partition(b":")
+            if not sep: continue
+            iface = name.strip().decode()
+            if not self.is_physical("net", iface): continue
+            fields = rest.split()
+            counters[iface] = (int(fields[0]), int(fields[8]))
+        return counters
+
+    def read_disk_bytes(self) -> dict[str, tuple[int, int]]:
+        """(read, written) byte counters per whole physical disk, partitions excluded."""
+        counters = {}
+        for line in self.diskstats.read().split(b"\n"):
+            fields = line.split()
+            if len(fields) < 10: continue
+            dev = fields[2].decode()
+            if not self.is_physical("block", dev): continue
+            counters[dev] = (int(fields[5]) * SECTOR_SIZE, int(fields[9]) * SECTOR_SIZE)
+        return counters
+
+    @staticmethod
+    def rates(current: dict, previous: dict, elapsed: float) -> list[tuple[str, float, float]]:
+        rates = []
+        for name, (a, b) in current.items():
+            prev_a, prev_b = previous.get(name, (a, b))
+            # Counters reset when a device is re-added, count that tick as idle
+            rates.append((name, max(a - prev_a, 0) / elapsed, max(b - prev_b, 0) / elapsed))
+        return rates
+
+    def sample(self) -> Snapshot:
+        snap = Snapshot()
+        now = time.monotonic()
+        elapsed = now - self._prev_time
+        self._prev_time = now
+
+        # CPU
+        current = self.read_cpu_times()
+        for (busy, total), (prev_busy, prev_total) in zip(current, self._prev_cpu):
+            delta = total - prev_total
+            snap.cpu_percent.append(round((busy - prev_busy) * 100 / delta, 1) if delta > 0 else 0.0)
+        self._prev_cpu = current
+        if snap.cpu_percent:
+            snap.cpu_avg = round(sum(snap.cpu_percent) / len(snap.cpu_percent), 1)
+
+        snap.cpu_freqs = self.cpu.read_freqs()
+        snap.throttle_events, snap.throttle_total = self.cpu.read_throttle()
+        snap.platform_profile = self.cpu.read_profile()
+
+        # Memory, same definitions as psutil
+        mem = {}
+        for line in self.meminfo.read().split(b"\n"):
+            key, _, rest = line.partition(b":")
+            if rest: mem[key] = int(rest.split()[0]) * 1024
+
+        snap.mem_total = mem.get(b"MemTotal", 0)
+        snap.mem_free = mem.get(b"MemFree", 0)
+        available = mem.get(b"MemAvailable", snap.mem_free)
+        cached = mem.get(b"Cached", 0) + mem.get(b"SReclaimable", 0)
+        snap.mem_used = snap.mem_total - snap.mem_free - mem.get(b"Buffers", 0) - cached
+        if snap.mem_used < 0: snap.mem_used = snap.mem_total - snap.mem_free
+        if snap.mem_total:
+            snap.mem_percent = round((snap.mem_total - available) * 100 / snap.mem_total, 1)
+
+        snap.swap_total = mem.get(b"SwapTotal", 0)
+        snap.swap_free = mem.get(b"SwapFree", 0)
+        snap.swap_used = snap.swap_total - snap.swap_free
+        if snap.swap_total:
+            snap.swap_percent = round(snap.swap_used * 100 / snap.swap_total, 1)
+
+        # Sensors
+        self.sensors.ensure()
+        for label, sensor in self.sensors.temps:
+            try: snap.temps.append((label, sensor.read_int() // 1000))
+            except (OSError, ValueError): continue
+        if snap.temps:
+            # Usually, the first entry (Package/Die) is the overall CPU temp
+            snap.temp = snap.temps[0][1]
+
+        for _, sensor in self.sensors.fans:
+            try:
+                snap.fan_rpm = sensor.read_int()
+                break
+            except (OSError, ValueError): continue
+
+        # Throughput
+        net, disk = self.read_net_bytes(), self.read_disk_bytes()
+        if elapsed > 0:
+            snap.net = self.rates(net, self._prev_net, elapsed)
+            snap.disks = self.rates(disk, self._prev_disk, elapsed)
+            snap.net_rx = sum(rx for _, rx, _ in snap.net)
+            snap.net_tx = sum(tx for _, _, tx in snap.net)
+            snap.disk_read = sum(r for _, r, _ in snap.disks)
+            snap.disk_write = sum(w for _, _, w in snap.disks)
+        self._prev_net, self._prev_disk = net, disk
+
+        return snap
+
+class AdaptiveScheduler:
+    """
+    Picks the next sampling interval from how close the metrics are to
+    their warning thresholds (load 1.0 = at the threshold) and how fast
+    that load is moving. Calm, flat readings back off towards max_interval,
+    anything approaching a warning snaps to min_interval.
+    """
+    NEAR_WARNING = 0.85
+    CALM = 0.6
+    FLAT = 0.03
+    MOVING = 0.1
+    BACKOFF = 1.5
+
+    def __init__(self, base: float, min_interval: float, max_interval: float):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.base = min(max(base, self.min_interval), self.max_interval)
+        self.interval = self.base
+        self._prev_load: float | None = None
+
+    def next_interval(self, load: float) -> float:
+        trend = 0.0 if self._prev_load is None else abs(load - self._prev_load)
+        self._prev_load = load
+
+        if load >= self.NEAR_WARNING or trend >= self.MOVING:
+            self.interval = self.min_interval
+        elif load < self.CALM and trend < self.FLAT:
+            self.interval = min(self.interval * self.BACKOFF, self.max_interval)
+        else:
+            self.interval = self.base
+        return self.interval
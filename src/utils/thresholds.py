@@ -0,0 +1,77 @@
+import time
+from dataclasses import dataclass
+from loguru import logger
+
+# metric: (rising, falling). A warning starts at `rising` and only ends below `falling`
+DEFAULT_THRESHOLDS = {
+    "temp": (90, 85),
+    "memory": (70, 65),
+    "cpu_avg": (60, 50),
+    "cpu_core": (80, 70),
+}
+DEFAULT_DWELL = 2.0
+
+@dataclass(slots=True)
+class Threshold:
+    """
+    Warning state with hysteresis: the value has to stay past the threshold
+    for `dwell` seconds before the state flips, and the way back uses the
+    lower `falling` threshold, so a value hovering at the edge never toggles.
+    """
+    rising: float
+    falling: float
+    dwell: float = DEFAULT_DWELL
+    active: bool = False
+    _since: float | None = None
+
+    def update(self, value: float, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        crossing = value < self.falling if self.active else value >= self.rising
+        if not crossing:
+            self._since = None
+        elif self._since is None:
+            self._since = now
+        if self._since is not None and now - self._since >= self.dwell:
+            self.active = not self.active
+            self._since = None
+        return self.active
+
+class ThresholdSet:
+    """
+    The sysmon warning thresholds, read from [sysmon.thresholds]:
+
+        temp = { rising = 90, falling = 85, dwell = 2 }
+    """
+
+    def __init__(self, config: dict):
+        self.thresholds: dict[str, Threshold] = {}
+        for metric, (rising, falling) in DEFAULT_THRESHOLDS.items():
+            entry = config.get(metric, {})
+            if not isinstance(entry, dict):
+                logger.warning(f"[Sysmon] Expected a table in \"thresholds.{metric}\", using defaults")
+                entry = {}
+            # Without an explicit falling, keep the default gap below whatever rising is
+            gap = rising - falling
+            rising = self.number(metric, entry, "rising", rising)
+            falling = self.number(metric, entry, "falling", max(rising - gap, 0), allow_zero=True)
+            if falling > rising:
+                logger.warning(f"[Sysmon] thresholds.{metric}: falling is above rising, using {rising} for both (no hysteresis)")
+                falling = rising
+            dwell = self.number(metric, entry, "dwell", DEFAULT_DWELL, allow_zero=True)
+            self.thresholds[metric] = Threshold(rising, falling, dwell)
+
+    @staticmethod
+    def number(metric: str, entry: dict, key: str, default: float, allow_zero: bool = False) -> float:
+        value = entry.get(key, default)
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0 or (value == 0 and not allow_zero):
+            logger.warning(f"[Sysmon] Expected a positive number in \"thresholds.{metric}.{key}\", got {value!r}")
+            return default
+        return value
+
+    def check(self, metric: str, value: float) -> bool:
+        """Feeds one sample and returns whether the metric is in warning."""
+        return self.thresholds[metric].update(value)
+
+    def load(self, metric: str, value: float) -> float:
+        """How close `value` is to the metric's rising threshold (1.0 = at it)."""
+        return value / self.thresholds[metric].rising
@@ -0,0 +1,53 @@
+from collections.abc import Callable
+from typing import Any
+
+from gi.repository import GLib, Gtk # type: ignore
+
+class LazyTooltip:
+    """
+    Tooltip whose markup is only built when GTK is about to show it.
+
+    Owners hand over their latest state with `update()`, which is a plain
+    attribute write and safe from any thread. `builder(state)` runs on
+    query-tooltip, at most once per state, so nothing is formatted or laid
+    out while nobody hovers the widget. `render(widget, tooltip, markup)`
+    can replace the default `tooltip.set_markup` for custom tooltip content.
+    """
+
+    def __init__(
+        self,
+        widget: Gtk.Widget,
+        builder: Callable[[Any], str | None],
+        render: Callable[[Gtk.Widget, Gtk.Tooltip, str], bool] | None = None,
+    ):
+        self.builder = builder
+        self.render = render
+        self.state: Any = None
+        self._built_for: Any = None
+        self._markup: str | None = None
+
+        widget.set_has_tooltip(True)
+        widget.connect("query-tooltip", self.on_query_tooltip)
+
+    def update(self, state: Any):
+        self.state = state
+
+    def markup(self) -> str | None:
+        state = self.state
+        if state is None: return None
+        if state is not self._built_for:
+            self._markup = self.builder(state)
+            self._built_for = state
+        return self._markup
+
+    def on_query_tooltip(self, widget, x, y, keyboard_mode, tooltip):
+        markup = self.markup()
+        if not markup: return False
+        if self.render is not None:
+            return self.render(widget, tooltip, markup)
+        tooltip.set_markup(markup)
+        return True
+
+def escape(text: str) -> str:
+    """Escapes untrusted text (app names, device labels) for tooltip markup."""
+    return GLib.markup_escape_text(text)
@@ -0,0 +1,65 @@
+import socket
+from collections.abc import Callable
+from loguru import logger
+from gi.repository import GLib # type: ignore
+
+NETLINK_KOBJECT_UEVENT = 15
+KERNEL_GROUP = 1
+
+class UeventMonitor:
+    """
+    Listens to kernel uevents on a netlink socket from the GLib main loop.
+    Nothing runs until the kernel reports a device change, so subscribers
+    get hotplug and power-supply notifications without any polling.
+    """
+
+    def __init__(self):
+        self.sock: socket.socket | None = None
+        self.subscribers: dict[str, list[Callable[[dict[str, str]], None]]] = {}
+
+    def subscribe(self, subsystem: str, callback: Callable[[dict[str, str]], None]):
+        """Calls `callback(event)` on the GTK thread for every uevent of `subsystem`."""
+        self.subscribers.setdefault(subsystem, []).append(callback)
+        if self.sock is None: self.start()
+
+    def start(self):
+        try:
+            self.sock = socket.socket(
+                socket.AF_NETLINK, socket.SOCK_DGRAM | socket.SOCK_NONBLOCK | socket.SOCK_CLOEXEC,
+                NETLINK_KOBJECT_UEVENT
+            )
+            self.sock.bind((0, KERNEL_GROUP))
+        except OSError as e:
+            logger.warning(f"[Uevent] Could not listen for kernel uevents: {e}")
+            self.sock = None
+            return
+        GLib.io_add_watch(self.sock.fileno(), GLib.PRIORITY_DEFAULT, GLib.IO_IN, self.on_readable)
+
+    def on_readable(self, fd, condition):
+        while True:
+            try:
+                data = self.sock.recv(8192) # type: ignore
+            except BlockingIOError:
+                break
+            except OSError as e:
+                # ENOBUFS: a burst overflowed the socket, later events still arrive
+                logger.debug(f"[Uevent] recv failed: {e}")
+                break
+
+            event = self.parse(data)
+            for callback in self.subscribers.get(event.get("SUBSYSTEM", ""), []):
+                try: callback(event)
+                except Exception as e: logger.exception(f"[Uevent] Subscriber failed: {e}")
+        return True
+
+    @staticmethod
+    def parse(data: bytes) -> dict[str, str]:
+        """Kernel uevents are "action@devpath" followed by NUL separated KEY=VALUE pairs."""
+        event = {}
+        for part in data.split(b"\0")[1:]:
+            key, sep, value = part.partition(b"=")
+            if sep: event[key.decode(errors="replace")] = value.decode(errors="replace")
+        return event
+
+# Global Instance
+UEVENTS = UeventMonitor()
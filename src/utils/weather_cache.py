@@ -0,0 +1,72 @@
+import os
+import json
+import time
+from pathlib import Path
+from loguru import logger
+from gi.repository import GLib # type: ignore
+
+class WeatherCache:
+    """
+    The last weather response on disk, with when it was fetched and the
+    server's Date/ETag. It lets the bar render instantly on startup (and
+    offline), and lets a refetch be skipped until the TTL runs out or be
+    answered with a 304 when nothing changed. Only the metadata is kept
+    in memory, the response itself is handed out by load() to be parsed.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or Path(GLib.get_user_cache_dir()) / "cnbshell" / "weather.json"
+        self.fetched_at = 0.0
+        self.date: str | None = None
+        self.etag: str | None = None
+        self.url: str | None = None
+
+    def read(self) -> dict | None:
+        try:
+            with open(self.path) as f:
+                entry = json.load(f)
+            float(entry["fetched_at"]), entry["data"]
+            return entry
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"[Weather] Ignoring unreadable cache {self.path}: {e}")
+            return None
+
+    def load(self):
+        entry = self.read()
+        if entry is None: return None
+        self.fetched_at = float(entry["fetched_at"])
+        self.date = entry.get("date")
+        self.etag = entry.get("etag")
+        self.url = entry.get("url")
+        return entry["data"]
+
+    def save(self, url: str, data, date: str | None, etag: str | None):
+        self.url, self.date, self.etag = url, date, etag
+        self.fetched_at = time.time()
+        self.write({"fetched_at": self.fetched_at, "date": date, "etag": etag, "url": url, "data": data})
+
+    def touch(self):
+        """Marks the cached data as confirmed now, e.g. after a 304."""
+        entry = self.read()
+        if entry is None or entry.get("url") != self.url: return
+        entry["fetched_at"] = self.fetched_at = time.time()
+        self.write(entry)
+
+    def write(self, entry: dict):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            # Atomic, a crash mid-write never leaves a truncated cache behind
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"[Weather] Could not write cache {self.path}: {e}")
+
+    def valid_for(self, url: str) -> bool:
+        return self.url == url
+
+    def age(self) -> float:
+        return max(time.time() - self.fetched_at, 0.0)
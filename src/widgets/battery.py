@@ -0,0 +1,178 @@
+import os
+from dataclasses import dataclass
+from fabric.widgets.button import Button
+from loguru import logger
+
+from src.config import SHELL_CONFIG
+from src.utils.sysmon_engine import ProcFile
+from src.utils.tooltip import LazyTooltip
+from src.utils.uevent import UEVENTS
+
+POWER_SUPPLY_ROOT = "/sys/class/power_supply"
+# 10% steps from empty to full
+LEVEL_ICONS = ["󰂎", "󰁺", "󰁻", "󰁼", "󰁽", "󰁾", "󰁿", "󰂀", "󰂁", "󰂂", "󰁹"]
+CHARGING_ICON = "󰂄"
+# Battery files, energy_* (µWh/µW) or charge_* (µAh/µA) depending on the driver
+BATTERY_FILES = ("capacity", "status", "energy_now", "energy_full", "power_now",
+                 "charge_now", "charge_full", "current_now", "voltage_now")
+
+@dataclass(slots=True, frozen=True)
+class BatteryState:
+    capacity: int
+    status: str
+    ac_online: bool
+    watts: float | None
+    hours: float | None # to empty while discharging, to full while charging
+
+    @property
+    def charging(self) -> bool:
+        return self.status in ("Charging", "Full") or (self.ac_online and self.status != "Discharging")
+
+def format_hours(hours: float) -> str:
+    h, m = divmod(round(hours * 60), 60)
+    return f"{h}h {m:02d}m" if h else f"{m}m"
+
+class PowerSupplies:
+    """
+    Batteries and AC adapters under /sys/class/power_supply, resolved once
+    with their files kept open. Peripheral batteries (scope=Device, e.g.
+    mice) are ignored. rescan() only runs when a supply is added or removed.
+    """
+
+    def __init__(self, root: str = POWER_SUPPLY_ROOT):
+        self.root = root
+        self.batteries: list[dict[str, ProcFile]] = []
+        self.adapters: list[ProcFile] = []
+        self.rescan()
+
+    def close(self):
+        for files in self.batteries:
+            for f in files.values(): f.close()
+        for f in self.adapters: f.close()
+        self.batteries, self.adapters = [], []
+
+    def rescan(self):
+        self.close()
+        try: supplies = sorted(os.listdir(self.root))
+        except OSError: supplies = []
+
+        for name in supplies:
+            path = f"{self.root}/{name}"
+            kind = self.read_once(f"{path}/type")
+            if kind == "Mains":
+                try: self.adapters.append(ProcFile(f"{path}/online", 8))
+                except OSError: continue
+            elif kind == "Battery" and self.read_once(f"{path}/scope") != "Device":
+                files = {}
+                for key in BATTERY_FILES:
+                    try: files[key] = ProcFile(f"{path}/{key}", 32)
+                    except OSError: continue
+                if "capacity" in files: self.batteries.append(files)
+
+        logger.info(f"[Battery] {len(self.batteries)} battery(ies), {len(self.adapters)} AC adapter(s)")
+
+    @staticmethod
+    def read_once(path: str) -> str:
+        try:
+            with open(path) as f:
+                return f.read().strip()
+        except OSError:
+            return ""
+
+    @staticmethod
+    def value(files: dict[str, ProcFile], key: str) -> int | None:
+        f = files.get(key)
+        if f is None: return None
+        try: return f.read_int()
+        except (OSError, ValueError): return None
+
+    def read(self) -> BatteryState | None:
+        """Combined state of all batteries, most laptops only have BAT0/BAT1."""
+        if not self.batteries: return None
+
+        ac_online = False
+        for f in self.adapters:
+            try: ac_online = ac_online or f.read_int() == 1
+            except (OSError, ValueError): continue
+
+        capacities, statuses = [], []
+        now = full = watts = 0.0
+        have_energy = True
+        for files in self.batteries:
+            capacity = self.value(files, "capacity")
+            if capacity is not None: capacities.append(capacity)
+            try: statuses.append(files["status"].read().decode().strip())
+            except (KeyError, OSError): pass
+
+            energy_now, energy_full = self.value(files, "energy_now"), self.value(files, "energy_full")
+            power = self.value(files, "power_now")
+            if energy_now is None:
+                # charge_* drivers: convert to energy with the current voltage
+                voltage = self.value(files, "voltage_now")
+                charge_now, charge_full = self.value(files, "charge_now"), self.value(files, "charge_full")
+                current = self.value(files, "current_now")
+                if None in (voltage, charge_now, charge_full):
+                    have_energy = False
+                    continue
+                energy_now = charge_now * voltage / 1e6 # type: ignore
+                energy_full = charge_full * voltage / 1e6 # type: ignore
+                power = abs(current) * voltage / 1e6 if current is not None else None # type: ignore
+            now += energy_now
+            full += energy_full or 0
+            watts += abs(power) if power else 0
+
+        status = next((s for s in ("Discharging", "Charging") if s in statuses), statuses[0] if statuses else "Unknown")
+        capacity = round(sum(capacities) / len(capacities)) if capacities else 0
+
+        hours = None
+        if have_energy and watts > 0:
+            if status == "Discharging": hours = now / watts
+            elif status == "Charging" and full > now: hours = (full - now) / watts
+        return BatteryState(capacity, status, ac_online, watts / 1e6 if watts else None, hours)
+
+class Battery(Button):
+    def __init__(self):
+        super().__init__(label="", style_classes="battery", visible=False)
+        self.set_no_show_all(True)
+        self.low_threshold = SHELL_CONFIG.battery.get("low", 15)
+        self.state: BatteryState | None = None
+
+        self.supplies = PowerSupplies()
+        self.tooltip = LazyTooltip(self, self.build_tooltip)
+
+        # No timer: the kernel sends a power_supply uevent on plug/unplug and
+        # whenever the firmware reports a new charge level
+        UEVENTS.subscribe("power_supply", self.on_uevent)
+        self.refresh()
+
+    def on_uevent(self, event: dict[str, str]):
+        if event.get("ACTION") in ("add", "remove"):
+            self.supplies.rescan()
+        self.refresh()
+
+    def refresh(self):
+        state = self.supplies.read()
+        if state == self.state: return
+        self.state = state
+        self.tooltip.update(state)
+
+        self.set_visible(state is not None)
+        if state is None: return
+
+        icon = CHARGING_ICON if state.charging else LEVEL_ICONS[min(state.capacity, 100) // 10]
+        self.set_label(f"{icon} {state.capacity}%")
+        if not state.charging and state.capacity <= self.low_threshold:
+            self.add_style_class("low")
+        else:
+            self.remove_style_class("low")
+
+    @staticmethod
+    def build_tooltip(state: BatteryState) -> str:
+        lines = [f"<b>{state.status}</b> · {state.capacity}%"]
+        if state.watts is not None:
+            lines.append(f"Rate: <b>{state.watts:.1f} W</b>")
+        if state.hours is not None:
+            until = "empty" if state.status == "Discharging" else "full"
+            lines.append(f"Until {until}: <b>{format_hours(state.hours)}</b>")
+        lines.append(f"AC: <b>{'plugged in' if state.ac_online else 'unplugged'}</b>")
+        return "\n".join(lines)
@@ -15,6 +15,13 @@ from fabric.widgets.scale import Scale
 from fabric.utils import exec_shell_command
 from gi.repository import GLib, Gtk, Gdk, Pango, GdkPixbuf # type: ignore
 
+from src.popup.privacy_log import privacy_log_popup
+from src.utils.image_cache import THUMBNAIL_CACHE
+
+# --- CONFIG ---
+ROW_SPACING = 10
+OVERSCAN_ROWS = 2
+
 # --- HELPERS ---
 def get_kbd_backlight_device():
     base = "/sys/class/leds"
@@ -254,15 +261,65 @@ class QuickSettings(Box):
         try: GLib.spawn_command_line_async("kitty -e nmtui")
         except: pass
 
+# --- ROW ANIMATION ---
+class RowAnimator:
+    """
+    Advances every moving row from a single tick callback on the dashboard
+    window, so all springs step together in sync with the frame clock and
+    nothing runs while nothing moves.
+    """
+    STEP_US = 16_000 # the spring constants were tuned for 16ms steps
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.active = {} # row -> monotonic start time in µs
+        self.tick_id = None
+        self.last_frame = None
+
+    def start(self, row, delay_ms=0):
+        self.active[row] = GLib.get_monotonic_time() + delay_ms * 1000
+        if self.tick_id is None:
+            self.last_frame = None
+            self.tick_id = self.widget.add_tick_callback(self.on_tick)
+
+    def stop(self, row):
+        self.active.pop(row, None)
+
+    def on_tick(self, widget, frame_clock):
+        now = frame_clock.get_frame_time()
+        # Catch up on dropped frames, but never jump more than a few steps
+        steps = 1 if self.last_frame is None else min(4, max(1, round((now - self.last_frame) / self.STEP_US)))
+        self.last_frame = now
+
+        for row, start in list(self.active.items()):
+            if now < start: continue
+            if not row.animation_step(steps): self.active.pop(row, None)
+
+        if not self.active:
+            self.tick_id = None
+            return GLib.SOURCE_REMOVE
+        return GLib.SOURCE_CONTINUE
+
 # --- NOTIFICATION ROW ---
 class NotificationRow(Gtk.EventBox):
-    def __init__(self, app_name, summary, body, time_str, image_pixbuf, icon_name, on_close_callback):
+    """
+    A recyclable row. Widgets are built once and filled by bind(), so the
+    dashboard only ever owns as many rows as fit in the viewport. The pin
+    belongs to the record and is kept by the dashboard, a row that is being
+    dragged or is sliding is busy and is never rebound.
+    """
+    def __init__(self, on_close_callback, on_pin_callback, on_settled_callback, animator):
         super().__init__()
+        self.record = None
+        self.animator = animator
         self.set_visible_window(False)
         self.on_close_callback = on_close_callback
-        self.is_pinned = False; self.is_text_interaction = False
-        self.has_body = bool(body and body.strip())
-        self.offset_x = 0.0; self.velocity_x = 0.0; self.is_animating = False
+        self.on_pin_callback = on_pin_callback
+        self.on_settled_callback = on_settled_callback
+        self.is_pinned = False; self.is_text_interaction = False; self.is_dragging = False
+        self.has_body = False
+        self.clearing = False # sliding out as part of Clear, can't be stopped
+        self.offset_x = 0.0; self.velocity_x = 0.0; self.is_animating = False; self.anim_mode = None
 
         self.add_events(Gdk.EventMask.ENTER_NOTIFY_MASK | Gdk.EventMask.LEAVE_NOTIFY_MASK | Gdk.EventMask.BUTTON_PRESS_MASK)
         self.connect("enter-notify-event", self.on_hover_enter)
@@ -281,38 +338,21 @@ class NotificationRow(Gtk.EventBox):
         self.overlay.add(self.content_layout)
 
         self.icon_box = Box(v_align="start", style_classes="notif-icon-box")
-        pixel_size = 48
-        image_widget = Gtk.Image()
-        if image_pixbuf:
-            w, h = image_pixbuf.get_width(), image_pixbuf.get_height()
-            if w > 128 or h > 128: image_pixbuf = image_pixbuf.scale_simple(pixel_size, pixel_size, GdkPixbuf.InterpType.BILINEAR)
-            image_widget.set_from_pixbuf(image_pixbuf)
-        else:
-            clean_icon = icon_name.replace("file://", "") if icon_name else ""
-            if clean_icon and os.path.exists(clean_icon):
-                try:
-                    pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(clean_icon, pixel_size, pixel_size, True)
-                    image_widget.set_from_pixbuf(pixbuf)
-                except: image_widget.set_from_icon_name("dialog-information", Gtk.IconSize.DIALOG)
-            elif clean_icon:
-                image_widget.set_from_icon_name(clean_icon, Gtk.IconSize.DIALOG)
-                image_widget.set_pixel_size(pixel_size)
-            else:
-                image_widget.set_from_icon_name("dialog-information", Gtk.IconSize.DIALOG)
-                image_widget.set_pixel_size(pixel_size)
-        self.icon_box.add(image_widget)
+        self.image_widget = Gtk.Image()
+        self.icon_box.add(self.image_widget)
         self.content_layout.add(self.icon_box)
 
         self.text_box = Box(orientation="v", spacing=4, h_expand=True)
         header = Box(orientation="h", spacing=10)
-        app_label = Label(label=app_name, style_classes="notif-app", h_align="start")
-        app_label.set_ellipsize(Pango.EllipsizeMode.END)
-        app_label.set_max_width_chars(18)
-        header.add(app_label)
-        header.add(Label(label=time_str, style_classes="notif-time", h_align="start"))
+        self.app_lbl = Label(label="", style_classes="notif-app", h_align="start")
+        self.app_lbl.set_ellipsize(Pango.EllipsizeMode.END)
+        self.app_lbl.set_max_width_chars(18)
+        header.add(self.app_lbl)
+        self.time_lbl = Label(label="", style_classes="notif-time", h_align="start")
+        header.add(self.time_lbl)
         self.text_box.add(header)
         
-        self.summary_lbl = Label(label=summary, justification="left", style_classes="notif-summary", h_align="start")
+        self.summary_lbl = Label(label="", justification="left", style_classes="notif-summary", h_align="start")
         self.summary_lbl.set_ellipsize(Pango.EllipsizeMode.END)
         self.summary_lbl.set_max_width_chars(26)
         self.summary_lbl.set_selectable(True)
@@ -321,7 +361,7 @@ class NotificationRow(Gtk.EventBox):
         self.text_box.add(self.summary_lbl)
         
         self.body_revealer = Revealer(transition_type="slide-down", transition_duration=250, child_revealed=False)
-        self.body_lbl = Label(label=body, justification="left", style_classes="notif-body", h_align="start")
+        self.body_lbl = Label(label="", justification="left", style_classes="notif-body", h_align="start")
         self.body_lbl.set_line_wrap(True)
         self.body_lbl.set_line_wrap_mode(Pango.WrapMode.WORD_CHAR)
         self.body_lbl.set_max_width_chars(28) 
@@ -330,8 +370,6 @@ class NotificationRow(Gtk.EventBox):
         self.body_lbl.connect("button-release-event", self.on_text_release)
         self.body_revealer.add(self.body_lbl)
         self.text_box.add(self.body_revealer)
-        if self.has_body: self.body_revealer.set_visible(True)
-        else: self.body_revealer.set_visible(False)
         self.content_layout.add(self.text_box)
 
         self.close_btn = Button(label="✕", style_classes="notif-close-btn", h_align="end", v_align="start", on_clicked=lambda *_: self.start_dismiss_animation())
@@ -339,13 +377,33 @@ class NotificationRow(Gtk.EventBox):
         self.show_all()
         self.body_revealer.set_reveal_child(False)
 
-    def update_content(self, summary, body, time_str, image_pixbuf, icon_name):
-        self.summary_lbl.set_label(summary)
-        if body and body.strip():
-            self.body_lbl.set_label(body); self.has_body = True; self.body_revealer.set_visible(True)
-        else:
-            self.has_body = False; self.body_revealer.set_reveal_child(False); self.body_revealer.set_visible(False)
-        self.update_visuals(image_pixbuf, icon_name)
+    @property
+    def is_busy(self):
+        return self.is_dragging or self.is_animating
+
+    def bind(self, record, image_pixbuf, pinned=False):
+        """Binds this row to another record and restores that record's pin."""
+        self.record = record
+        self.clearing = False
+        self.offset_x = 0.0; self.velocity_x = 0.0
+        self.overlay.set_margin_start(0)
+
+        self.app_lbl.set_label(record.app_name)
+        self.time_lbl.set_label(record.time_str())
+        self.summary_lbl.set_label(record.summary)
+        self.has_body = bool(record.body and record.body.strip())
+        if self.has_body: self.body_lbl.set_label(record.body)
+        self.body_revealer.set_visible(self.has_body)
+
+        self.is_pinned = pinned
+        ctx = self.overlay.get_style_context()
+        if pinned: ctx.add_class("pinned")
+        else: ctx.remove_class("pinned")
+        # Pinned records are shown expanded, without replaying the slide
+        self.body_revealer.set_transition_duration(0)
+        self.body_revealer.set_reveal_child(pinned and self.has_body)
+        self.body_revealer.set_transition_duration(250)
+        self.update_visuals(image_pixbuf, record.icon)
 
     def update_visuals(self, image_pixbuf, icon_name):
         pixel_size = 48
@@ -356,10 +414,10 @@ class NotificationRow(Gtk.EventBox):
         else:
             clean_icon = icon_name.replace("file://", "") if icon_name else ""
             if clean_icon and os.path.exists(clean_icon):
-                try:
-                    pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(clean_icon, pixel_size, pixel_size, True)
-                    self.image_widget.set_from_pixbuf(pixbuf)
-                except: self.image_widget.set_from_icon_name("dialog-information", Gtk.IconSize.DIALOG)
+                # Rows are rebound on every scroll, decode each file only once
+                pixbuf = THUMBNAIL_CACHE.load_file(clean_icon, pixel_size)
+                if pixbuf is not None: self.image_widget.set_from_pixbuf(pixbuf)
+                else: self.image_widget.set_from_icon_name("dialog-information", Gtk.IconSize.DIALOG)
             elif clean_icon:
                 self.image_widget.set_from_icon_name(clean_icon, Gtk.IconSize.DIALOG)
                 self.image_widget.set_pixel_size(pixel_size)
@@ -373,49 +431,63 @@ class NotificationRow(Gtk.EventBox):
         ctx = self.overlay.get_style_context()
         if self.is_pinned: ctx.add_class("pinned"); self.body_revealer.set_reveal_child(True) if self.has_body else None
         else: ctx.remove_class("pinned")
+        if self.record is not None: self.on_pin_callback(self.record, self.is_pinned)
         return False
 
     def on_text_press(self, w, e): self.is_text_interaction = True; return False 
     def on_text_release(self, w, e): self.is_text_interaction = False; return False
-    def on_drag_begin(self, g, x, y): self.is_animating = False; self.velocity_x = 0; g.set_state(Gtk.EventSequenceState.DENIED) if self.is_text_interaction else None
+    def on_drag_begin(self, g, x, y):
+        # Its record is already dismissed, grabbing it must not snap it back
+        if self.clearing: g.set_state(Gtk.EventSequenceState.DENIED); return
+        self.is_animating = False; self.animator.stop(self); self.velocity_x = 0
+        if self.is_text_interaction: g.set_state(Gtk.EventSequenceState.DENIED)
+        else: self.is_dragging = True
     def on_drag_update(self, g, x, y): 
+        if self.clearing: return
         if x > 0: self.offset_x = float(x); self.overlay.set_margin_start(int(self.offset_x))
     def on_drag_end(self, g, x, y): 
+        if self.clearing: return
+        self.is_dragging = False
         self.velocity_x = x * 0.1 
         if x > 100: self.start_dismiss_animation()
         else: self.start_snap_back_animation()
 
     def start_snap_back_animation(self):
-        self.is_animating = True; tension = 0.6; friction = 0.75
-        def _step():
-            if not self.is_animating: return False
-            self.velocity_x += (0 - self.offset_x) * tension; self.velocity_x *= friction
-            self.offset_x += self.velocity_x
-            if abs(self.offset_x) < 0.5 and abs(self.velocity_x) < 0.5:
-                self.offset_x = 0; self.overlay.set_margin_start(0); self.is_animating = False; return False 
-            self.overlay.set_margin_start(max(0, int(self.offset_x))); return True
-        GLib.timeout_add(16, _step)
-
-    def start_dismiss_animation(self):
-        self.is_animating = True
+        self.is_animating = True; self.anim_mode = "snap"
+        self.animator.start(self)
+
+    def start_dismiss_animation(self, delay_ms=0):
+        self.is_animating = True; self.anim_mode = "dismiss"
         if self.velocity_x < 5: self.velocity_x = 20
-        def _step():
-            if not self.is_animating: return False
-            self.velocity_x *= 1.15; self.offset_x += self.velocity_x
-            if self.offset_x > 500: self.close_notification(); return False
-            self.overlay.set_margin_start(max(0, int(self.offset_x))); return True
-        GLib.timeout_add(16, _step)
+        self.animator.start(self, delay_ms)
+
+    def animation_step(self, steps):
+        """Advances the active spring by `steps` 16ms steps. Returns False once settled."""
+        if not self.is_animating: return False
+        for _ in range(steps):
+            if self.anim_mode == "snap":
+                tension = 0.6; friction = 0.75
+                self.velocity_x += (0 - self.offset_x) * tension; self.velocity_x *= friction
+                self.offset_x += self.velocity_x
+                if abs(self.offset_x) < 0.5 and abs(self.velocity_x) < 0.5:
+                    self.offset_x = 0; self.overlay.set_margin_start(0); self.is_animating = False
+                    self.on_settled_callback(self); return False
+            else:
+                self.velocity_x *= 1.15; self.offset_x += self.velocity_x
+                if self.offset_x > 500:
+                    self.is_animating = False; self.close_notification(); return False
+        self.overlay.set_margin_start(max(0, int(self.offset_x))); return True
 
     def on_hover_enter(self, w, e): 
         if self.has_body: self.body_revealer.set_reveal_child(True)
     def on_hover_leave(self, w, e): 
         if e.detail == Gdk.NotifyType.INFERIOR or self.is_pinned: return
         self.body_revealer.set_reveal_child(False)
-    def close_notification(self): self.on_close_callback(self); self.destroy()
+    def close_notification(self): self.on_close_callback(self)
 
 
 class SystemDashboard(Window):
-    def __init__(self, dnd_callback, count_callback, **kwargs):
+    def __init__(self, dnd_callback, count_callback, history, **kwargs):
         super().__init__(
             title="SystemDashboard",
             anchor="top right", layer="top", margin="5px 10px 0px 0px", exclusivity="none",
@@ -423,7 +495,25 @@ class SystemDashboard(Window):
         )
         self.dnd_callback = dnd_callback
         self.count_callback = count_callback # Callback to update the bar icon
-        self.active_rows = {} 
+        self.history = history
+        self.history_loaded = False
+        self.history_exhausted = False
+
+        # --- VIRTUAL LIST STATE ---
+        # records: every loaded, undismissed notification, newest first
+        # row_pool: the recycled row widgets, at most one screenful + overscan
+        self.records = []
+        self.tracked = {}
+        self.row_pool = []
+        # Pins belong to the record, not to whichever row shows it
+        self.pinned = set() # record ids
+        # row_height: mean collapsed height of the rows measured so far
+        self.row_height = 90
+        self.row_heights = {} # record id -> collapsed height
+        self.row_heights_total = 0
+        self.render_idle = None
+        self.clearing = set() # rows still sliding out after Clear
+        self.animator = RowAnimator(self)
 
         self.root_box = Box(orientation="v", spacing=0, name="NOTIF_ROOT", style_classes="dashboard-root")
         
@@ -439,6 +529,10 @@ class SystemDashboard(Window):
         
         self.clear_btn = Button(label="Clear", style_classes="dashboard-clear-btn", on_clicked=self.clear_all_notifications, h_align="end", v_align="center")
         self.header_box.pack_end(self.clear_btn, False, False, 0)
+
+        self.privacy_btn = Button(style_classes="dashboard-dnd-btn", tooltip_text="Privacy log", on_clicked=lambda *_: privacy_log_popup().toggle(), h_align="end", v_align="center")
+        self.privacy_btn.add(Label(label="󰒃", style_classes="txt-icon"))
+        self.header_box.pack_end(self.privacy_btn, False, False, 0)
         self.root_box.add(self.header_box)
 
         # 2. QUICK SETTINGS
@@ -450,17 +544,34 @@ class SystemDashboard(Window):
         self.root_box.add(self.notif_header)
 
         self.scroll = ScrolledWindow(min_content_size=(360, 300), max_content_size=(360, 600), propagate_natural_width=True, propagate_natural_height=True, name="NOTIF_SCROLL")
-        self.vbox = Box(orientation="v", spacing=10, style_classes="notification-list")
+        self.vbox = Box(orientation="v", spacing=ROW_SPACING, style_classes="notification-list")
         self.placeholder = Label(label="No Notifications", style_classes="notif-placeholder", visible=True)
+        # Spacers stand in for the rows above and below the viewport
+        self.top_spacer = Box(visible=False)
+        self.bottom_spacer = Box(visible=False)
+        self.top_spacer.set_no_show_all(True); self.bottom_spacer.set_no_show_all(True)
         self.vbox.add(self.placeholder)
+        self.vbox.add(self.top_spacer)
+        self.vbox.add(self.bottom_spacer)
         self.scroll.add(self.vbox)
+        self.vadjustment = self.scroll.get_vadjustment()
+        self.vadjustment.connect("value-changed", lambda *_: self.render_rows())
+        self.vadjustment.connect("changed", lambda *_: self.render_rows())
         self.root_box.add(self.scroll)
 
         self.add(self.root_box)
         self.show_all()
         self.hide()
         
-        self.connect("map", lambda *_: self.quick_settings.refresh())
+        self.connect("map", self.on_map)
+
+    def on_map(self, *_):
+        self.quick_settings.refresh()
+        # History is paged in lazily the first time the dashboard is shown
+        if not self.history_loaded:
+            self.history_loaded = True
+            self.load_history_page()
+            self.render_rows()
 
     # --- API ---
     def get_vol(self):
@@ -476,75 +587,180 @@ class SystemDashboard(Window):
         1. Checks if list is empty -> Toggles placeholder.
         2. Calculates count -> Updates NotificationIndicator via callback.
         """
-        children = [c for c in self.vbox.get_children() if isinstance(c, NotificationRow)]
-        count = len(children)
+        has_rows = bool(self.records)
+        count = self.history.count()
         
         # Toggle Placeholder
-        if count == 0: self.placeholder.set_visible(True)
-        else: self.placeholder.set_visible(False)
+        if self.placeholder.get_visible() == has_rows: self.placeholder.set_visible(not has_rows)
         
         # Update Bar Indicator
         if self.count_callback:
             self.count_callback(count)
 
-    def add_or_update_notification(self, app_name, summary, body, time_str, image_pixbuf, icon_name, replaces_id, sync_tag):
-        HISTORY_LIMIT = 25
-        
-        if self.placeholder.get_visible(): self.placeholder.set_visible(False)
+    # --- VIRTUAL LIST ---
+    def render_rows(self):
+        """
+        Binds pooled rows to the records inside the viewport (plus overscan)
+        and sizes the spacers so the scrollbar reflects the whole list.
+        """
+        if self.clearing: return
+        # A row being dragged or sliding out stays on its record, the list
+        # is rendered again once it settles (on_row_settled/on_row_closed)
+        if any(row.record is not None and row.is_busy for row in self.row_pool): return
+
+        value = self.vadjustment.get_value()
+        page_size = self.vadjustment.get_page_size() or self.row_height * 4
+
+        first = max(0, int(value // self.row_height) - OVERSCAN_ROWS)
+        wanted = int(page_size // self.row_height) + 1 + 2 * OVERSCAN_ROWS
+
+        # Page older records in before the viewport runs out of them
+        if first + wanted >= len(self.records) and not self.history_exhausted and self.history_loaded:
+            self.load_history_page()
+
+        last = min(len(self.records), first + wanted)
+        visible = self.records[first:last]
+
+        while len(self.row_pool) < len(visible):
+            row = NotificationRow(
+                on_close_callback=self.on_row_closed, on_pin_callback=self.on_row_pinned,
+                on_settled_callback=self.on_row_settled, animator=self.animator
+            )
+            row.set_no_show_all(True)
+            row.connect("size-allocate", self.on_row_allocated)
+            self.vbox.pack_start(row, False, False, 0)
+            self.vbox.reorder_child(row, len(self.row_pool) + 2)
+            self.row_pool.append(row)
+
+        for row, record in zip(self.row_pool, visible):
+            if row.record is not record:
+                row.bind(record, self.history.load_thumbnail(record.thumb), record.id in self.pinned)
+            if not row.get_visible(): row.set_visible(True)
+        for row in self.row_pool[len(visible):]:
+            if row.get_visible(): row.set_visible(False)
+            row.record = None
+
+        self.set_spacer(self.top_spacer, first * self.row_height)
+        self.set_spacer(self.bottom_spacer, (len(self.records) - last) * self.row_height)
+        return False
 
-        track_key = None
-        if sync_tag: track_key = f"sync:{sync_tag}"
-        elif replaces_id and int(replaces_id) > 0: track_key = f"id:{replaces_id}"
+    def set_spacer(self, spacer, height):
+        # Box spacing is added around visible spacers, take it back out
+        height = int(height) - ROW_SPACING
+        if height <= 0:
+            if spacer.get_visible(): spacer.set_visible(False)
+            return
+        if spacer.get_size_request()[1] != height: spacer.set_size_request(-1, height)
+        if not spacer.get_visible(): spacer.set_visible(True)
+
+    def on_row_allocated(self, row, allocation):
+        # Collapsed rows define the estimate, expanded (or collapsing) ones are the exception
+        if row.record is None or row.is_pinned: return
+        if row.body_revealer.get_reveal_child() or row.body_revealer.get_child_revealed(): return
+        height = allocation.height + ROW_SPACING
+        previous = self.row_heights.get(row.record.id)
+        if previous == height: return
+        self.row_heights[row.record.id] = height
+        self.row_heights_total += height - (previous or 0)
+
+        # A running mean settles as rows are measured, snapping to the last
+        # row would flip between rows with and without a body and rescale
+        # the top spacer under the scroll position every time
+        estimate = self.row_heights_total / len(self.row_heights)
+        if abs(estimate - self.row_height) > 2:
+            self.row_height = estimate
+            if self.render_idle is None:
+                self.render_idle = GLib.idle_add(self.on_render_idle)
+
+    def on_render_idle(self):
+        self.render_idle = None
+        self.render_rows()
+        return False
 
-        if track_key and track_key in self.active_rows:
-            try:
-                row = self.active_rows[track_key]
-                row.update_content(summary, body, time_str, image_pixbuf, icon_name)
-                self.vbox.reorder_child(row, 0)
-                return
-            except: del self.active_rows[track_key]
-
-        row = NotificationRow(app_name, summary, body, time_str, image_pixbuf, icon_name, on_close_callback=self.on_row_closed)
-        row._track_key = track_key
-        if track_key: self.active_rows[track_key] = row
-        
-        self.vbox.pack_start(row, False, False, 0)
-        self.vbox.reorder_child(row, 0)
-        row.show_all()
-
-        children = self.vbox.get_children()
-        if len(children) > HISTORY_LIMIT:
-            # Because you reorder new items to 0, the oldest is the last item
-            oldest_widget = children[-1]
-            
-            # Cleanup the tracking dictionary to prevent memory leaks
-            if hasattr(oldest_widget, "_track_key") and oldest_widget._track_key:
-                if oldest_widget._track_key in self.active_rows:
-                    del self.active_rows[oldest_widget._track_key]
+    def apply_notifications(self, records):
+        """
+        Applies one frame's worth of stored records, oldest first.
+        Superseded updates were already collapsed by the batcher, so every
+        entry here is either new or replaces one tracked record.
+        """
+        replaced = set()
+        for record in records:
+            if record.track_key:
+                previous = self.tracked.get(record.track_key)
+                if previous is not None:
+                    replaced.add(previous.id)
+                    # An update of the same notification keeps its pin
+                    if previous.id in self.pinned:
+                        self.pinned.discard(previous.id); self.pinned.add(record.id)
+                self.tracked[record.track_key] = record
+        if replaced:
+            self.records = [r for r in self.records if r.id not in replaced]
+            for record_id in replaced:
+                height = self.row_heights.pop(record_id, None)
+                if height is not None: self.row_heights_total -= height
+
+        self.records[:0] = reversed(records)
+        self.render_rows()
+        self.check_empty()
+        return False
 
-            self.vbox.remove(oldest_widget)
-            oldest_widget.destroy()
-        
-        # Update count immediately
+    def load_history_page(self):
+        """Appends the next page of older records below the loaded ones."""
+        PAGE_SIZE = 25
+        before_id = self.records[-1].id if self.records else None
+        page = self.history.page(before_id, PAGE_SIZE)
+        if len(page) < PAGE_SIZE: self.history_exhausted = True
+        self.records.extend(page)
         self.check_empty()
 
+    def remove_record(self, record):
+        if record.track_key and self.tracked.get(record.track_key) is record:
+            del self.tracked[record.track_key]
+        try: self.records.remove(record)
+        except ValueError: pass
+        height = self.row_heights.pop(record.id, None)
+        if height is not None: self.row_heights_total -= height
+        self.pinned.discard(record.id)
+
+    def on_row_pinned(self, record, pinned):
+        if pinned: self.pinned.add(record.id)
+        else: self.pinned.discard(record.id)
+
+    def on_row_settled(self, row):
+        self.render_rows()
+
     def on_row_closed(self, row):
-        if hasattr(row, '_track_key') and row._track_key and row._track_key in self.active_rows:
-            del self.active_rows[row._track_key]
-        
-        # Update count after animation ensures it's gone
-        GLib.idle_add(self.check_empty)
+        record = row.record
+        if record is None: return
+        self.remove_record(record)
+        self.history.dismiss(record.id)
+
+        if row in self.clearing:
+            # Rows are still sliding out, rebinding them now would restart
+            # their animations. The last one to finish renders the list.
+            self.clearing.discard(row)
+            row.clearing = False
+            row.set_visible(False)
+            if not self.clearing: self.render_rows()
+        else:
+            self.render_rows()
+        self.check_empty()
 
     def clear_all_notifications(self, *args):
-        children = [c for c in self.vbox.get_children() if isinstance(c, NotificationRow)]
-        if not children: return
-        
-        delay = 0
-        for child in children:
-            GLib.timeout_add(delay, child.start_dismiss_animation)
-            delay += 50
-        
-        # Clear tracking dict
-        self.active_rows.clear()
+        animated = [row for row in self.row_pool if row.get_visible() and row.record is not None]
+        if not animated: return
+
+        # Off-screen records go immediately, on-screen ones slide out first
+        on_screen = {row.record.id for row in animated}
+        for record in [r for r in self.records if r.id not in on_screen]:
+            self.remove_record(record)
+        self.history_exhausted = True
+        self.history.dismiss_all()
+
+        # Staggered starts, all advanced by the same tick callback
+        self.clearing = set(animated)
+        for index, child in enumerate(animated):
+            child.clearing = True
+            child.start_dismiss_animation(delay_ms=index * 50)
 
     def on_dnd_click(self, btn): self.dnd_callback()
\ No newline at end of file
@@ -2,9 +2,13 @@ from fabric.hyprland.widgets import HyprlandLanguage
 from fabric.utils import FormattedString
 from fabric.utils import exec_shell_command
 from src.utils.languages import EMOJI_LANGUAGES
+from src.utils.tooltip import LazyTooltip
 
 class Hyprlang(HyprlandLanguage):
     def __init__(self, **kwargs):
+        # The formatter already runs inside super().__init__, before the tooltip exists
+        self.tooltip = None
+        self.current_lang = None
         super().__init__(
             formatter=FormattedString(
                 "{get_emoji(language)}",
@@ -14,6 +18,8 @@ class Hyprlang(HyprlandLanguage):
             **kwargs
         )
         
+        self.tooltip = LazyTooltip(self, lambda lang: lang[:3].upper())
+        self.tooltip.update(self.current_lang)
         self.connect('button-press-event', self.on_click)
 
     def get_emoji_and_update_tooltip(self, lang):   
@@ -24,7 +30,8 @@ class Hyprlang(HyprlandLanguage):
         except (KeyError, AttributeError, IndexError):
             emoji = lang
 
-        self.set_tooltip_text(lang[:3].upper())
+        self.current_lang = lang
+        if self.tooltip is not None: self.tooltip.update(lang)
 
         return emoji
 
@@ -1,33 +1,29 @@
-import datetime
-import threading 
-import subprocess
 import atexit
+import threading
 import psutil
 import socket
-from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+from loguru import logger
 
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
 from fabric.widgets.label import Label
 from fabric.utils import exec_shell_command
-from gi.repository import GLib, GdkPixbuf # type: ignore
+from gi.repository import GLib, Gio # type: ignore
 
 from src.widgets.dashboard import SystemDashboard
 from src.widgets.keyboardstatus import KeyboardStatus
+from src.utils.image_cache import THUMBNAIL_CACHE
+from src.utils.notification_history import NotificationHistory
 
 # --- CONFIG ---
 MAX_IMAGE_BYTES = 5 * 1024 * 1024  
 MAX_TEXT_LEN = 1000                
 SAFE_ICON_SIZE = 48                
 
-# --- HELPER: SAFE STRING PARSING ---
-def safe_extract_string(line):
-    start = line.find('"')
-    if start == -1: return None
-    end = line.rfind('"')
-    if end <= start: return None
-    raw = line[start+1:end]
-    return raw.replace('\\"', '"').replace('\\\\', '\\')
+NOTIFY_MATCH_RULE = "type='method_call',interface='org.freedesktop.Notifications',member='Notify'"
+NOTIFY_SIGNATURE = "(susssasa{sv}i)"
+IMAGE_HINTS = ("image-data", "image_data", "icon_data")
 
 # --- HELPER: DND CHECK ---
 def get_dnd_status():
@@ -50,6 +46,39 @@ def check_internet():
         return True
     except OSError: return False
 
+# --- HELPER: BURST COALESCING ---
+class NotificationBatcher:
+    """
+    Collects stored notifications from the monitor thread and hands them to
+    the GTK thread once per frame. An update keyed by replaces_id or a
+    synchronous tag supersedes any pending entry with the same key.
+    """
+    FRAME_MS = 16
+
+    def __init__(self, apply_callback):
+        self.apply_callback = apply_callback
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+    def push(self, record):
+        key = record.track_key or record.id
+        with self._lock:
+            # Re-insert so the superseding update keeps its place as newest
+            self._pending.pop(key, None)
+            self._pending[key] = record
+            if not self._scheduled:
+                self._scheduled = True
+                GLib.timeout_add(self.FRAME_MS, self._flush)
+
+    def _flush(self):
+        with self._lock:
+            batch = list(self._pending.values())
+            self._pending.clear()
+            self._scheduled = False
+        if batch: self.apply_callback(batch)
+        return False
+
 class NotificationIndicator(Button):
     def __init__(self, **kwargs):
         super().__init__(
@@ -60,10 +89,13 @@ class NotificationIndicator(Button):
         self.set_no_show_all(True)
 
         # --- INSTANTIATE DASHBOARD ---
+        self.history = NotificationHistory()
         self.dashboard = SystemDashboard(
             dnd_callback=self.handle_dnd_toggle,
-            count_callback=self.update_count_display # Pass the callback!
+            count_callback=self.update_count_display, # Pass the callback!
+            history=self.history
         )
+        self.batcher = NotificationBatcher(self.dashboard.apply_notifications)
 
         self.connect("clicked", self.toggle_dashboard)
         
@@ -84,9 +116,12 @@ class NotificationIndicator(Button):
         self.unread_count = 0
         
         # --- START PROCESSES ---
-        # 1. DBus Monitor (Background Thread)
-        self._monitor_thread = threading.Thread(target=self.monitor_dbus_subprocess, daemon=True)
-        self._monitor_thread.start()
+        # 1. DBus Monitor (messages arrive on the GDBus worker thread and are
+        # decoded on a single worker of our own, in order, so updates of the
+        # same notification can't overtake each other)
+        self._decoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="notify-decode")
+        self._monitor_conn = None
+        self.start_dbus_monitor()
         
         # 2. Initial State Checks
         self.update_dnd_state()
@@ -158,115 +193,98 @@ class NotificationIndicator(Button):
 
         return True # Keep GLib timer running
 
-    # --- DBUS MONITOR (Existing Logic) ---
-    def monitor_dbus_subprocess(self):
-        cmd = ["dbus-monitor", "interface='org.freedesktop.Notifications',member='Notify'"]
+    # --- DBUS MONITOR ---
+    def start_dbus_monitor(self):
+        """
+        Opens a private session bus connection and turns it into a monitor.
+        A monitor connection cannot be used for anything else, so it must not
+        be the shared bus returned by Gio.bus_get_sync.
+        """
         try:
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1, shell=False)
-        except FileNotFoundError:
-            print("Error: dbus-monitor not installed.")
+            address = Gio.dbus_address_get_for_bus_sync(Gio.BusType.SESSION, None)
+            self._monitor_conn = Gio.DBusConnection.new_for_address_sync(
+                address,
+                Gio.DBusConnectionFlags.AUTHENTICATION_CLIENT | Gio.DBusConnectionFlags.MESSAGE_BUS_CONNECTION,
+                None, None
+            )
+            self._monitor_conn.set_exit_on_close(False)
+            # Install the filter first so no Notify call slips through between
+            # BecomeMonitor returning and the filter being attached
+            self._monitor_conn.add_filter(self.on_dbus_message)
+            self._monitor_conn.call_sync(
+                "org.freedesktop.DBus", "/org/freedesktop/DBus",
+                "org.freedesktop.DBus.Monitoring", "BecomeMonitor",
+                GLib.Variant("(asu)", ([NOTIFY_MATCH_RULE], 0)),
+                None, Gio.DBusCallFlags.NONE, -1, None
+            )
+        except GLib.Error as e:
+            logger.error(f"[Notification] Could not become a D-Bus monitor: {e.message}")
+            self._monitor_conn = None
             return
 
-        atexit.register(lambda: process.terminate() if process.poll() is None else None)
+        atexit.register(lambda: self._monitor_conn.close_sync(None) if self._monitor_conn and not self._monitor_conn.is_closed() else None)
 
-        current_msg = self.new_msg_template()
-        arg_index = -1 
-        in_hints = False
-        in_image_struct = False
-        current_hint_key = None
-        image_ints = []
-        hex_buffer = []
-        total_image_bytes = 0
+    def on_dbus_message(self, connection, message, incoming):
+        """
+        Runs on the GDBus worker thread for every message on the monitor
+        connection, which every D-Bus connection in the shell shares, so it
+        only picks the Notify body out and hands it to the decoder. Notify
+        calls are consumed here, everything else (e.g. the BecomeMonitor
+        reply) is passed through untouched.
+        """
+        if not incoming or message.get_message_type() != Gio.DBusMessageType.METHOD_CALL:
+            return message
+        if message.get_interface() != "org.freedesktop.Notifications" or message.get_member() != "Notify":
+            return message
 
-        for line in process.stdout: # type: ignore
-            line = line.strip()
-            
-            if "member=Notify" in line or "member='Notify'" in line:
-                if current_msg["app_name"] or current_msg["summary"]:
-                    self.finalize_message(current_msg)
-                current_msg = self.new_msg_template()
-                arg_index = -1; in_hints = False; in_image_struct = False; total_image_bytes = 0
-                continue
-
-            if not in_image_struct and not in_hints:
-                is_type_decl = line.startswith("string ") or line.startswith("uint32 ") or line.startswith("int32 ") or line.startswith("array [")
-                if is_type_decl and not line.startswith("variant"):
-                    arg_index += 1
-
-            if arg_index == 1 and line.startswith("uint32 "):
-                try: current_msg["replaces_id"] = int(line.split()[1])
-                except: pass
-
-            if line.startswith('string "') and not in_image_struct:
-                content = safe_extract_string(line)
-                if content is not None:
-                    if arg_index == 0: current_msg["app_name"] = content
-                    elif arg_index == 2: current_msg["icon"] = content
-                    elif arg_index == 3: current_msg["summary"] = content
-                    elif arg_index == 4: current_msg["body"] = content
-                    if in_hints:
-                        if current_hint_key is None: current_hint_key = content
-                        else:
-                            current_msg["hints"][current_hint_key] = content
-                            current_hint_key = None
-
-            if arg_index == 6:
-                if line.startswith("array ["): in_hints = True
-                if line == "]": in_hints = False
-            
-            if in_hints and "dict entry(" in line: current_hint_key = None
-
-            if '"image-data"' in line or '"image_data"' in line or '"icon_data"' in line:
-                in_image_struct = True; image_ints = []; hex_buffer = []
-                continue
-
-            if in_image_struct:
-                if line.startswith("int32 ") or line.startswith("boolean "):
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        val = parts[1]
-                        image_ints.append(1 if val == "true" else 0 if val == "false" else int(val))
-                elif total_image_bytes < MAX_IMAGE_BYTES and all(c in "0123456789abcdefABCDEF " for c in line) and len(line) > 5:
-                    hex_buffer.append(line)
-                    total_image_bytes += len(line) // 2
-                if line == "}" or (line == "]" and len(hex_buffer) > 0):
-                    if len(image_ints) >= 5 and hex_buffer:
-                        try:
-                            # 1. Reconstruct raw bytes
-                            full_hex = "".join(hex_buffer).replace(" ", "")
-                            raw_data = bytes.fromhex(full_hex)
-                            
-                            width = image_ints[0]
-                            height = image_ints[1]
-                            rowstride = image_ints[2]
-                            has_alpha = bool(image_ints[3])
-                            bits_per_sample = image_ints[4]
-                            
-                            # 2. Load into Pillow
-                            mode = 'RGBA' if has_alpha else 'RGB'
-                            img = Image.frombytes(mode, (width, height), raw_data, 'raw', mode, rowstride, 1)
-
-                            img.thumbnail((42, 42), Image.Resampling.LANCZOS)
-                            
-                            # 4. Save back to the message structure
-                            new_width, new_height = img.size
-                            new_rowstride = new_width * (4 if has_alpha else 3)
-                            
-                            current_msg["img_struct"] = [
-                                new_width, 
-                                new_height, 
-                                new_rowstride, 
-                                has_alpha, 
-                                bits_per_sample, 
-                                img.tobytes()
-                            ]
-                        except Exception as e:
-                            print(f"Image resize failed: {e}")
-                            pass
-                    in_image_struct = False
+        body = message.get_body()
+        if body is None or body.get_type_string() != NOTIFY_SIGNATURE:
+            return None
+
+        self._decoder.submit(self.handle_notify_call, body)
+        return None
+
+    def handle_notify_call(self, body):
+        """Decoder thread: parses the call, decodes its image and stores it."""
+        try:
+            self.finalize_message(self.parse_notify_call(body))
+        except Exception as e:
+            logger.warning(f"[Notification] Failed to parse Notify call: {e}")
+
+    def parse_notify_call(self, body):
+        """Decodes the (susssasa{sv}i) Notify arguments into a message dict."""
+        msg = self.new_msg_template()
+        msg["app_name"] = body.get_child_value(0).get_string()
+        msg["replaces_id"] = body.get_child_value(1).get_uint32()
+        msg["icon"] = body.get_child_value(2).get_string()
+        msg["summary"] = body.get_child_value(3).get_string()[:MAX_TEXT_LEN]
+        msg["body"] = body.get_child_value(4).get_string()[:MAX_TEXT_LEN]
+
+        # Walk the hints without unpacking them: unpack() would turn an
+        # image byte array into a Python list of ints
+        hints = body.get_child_value(6)
+        for i in range(hints.n_children()):
+            entry = hints.get_child_value(i)
+            key = entry.get_child_value(0).get_string()
+            value = entry.get_child_value(1).get_variant()
+
+            if key in IMAGE_HINTS:
+                if msg["image"] is None and value.get_type_string() == "(iiibiiay)":
+                    decoded = self.decode_image_hint(value)
+                    if decoded: msg["image_key"], msg["image"] = decoded
+            elif value.get_type_string() in ("s", "b", "y", "i", "u"):
+                msg["hints"][key] = value.unpack()
+        return msg
+
+    def decode_image_hint(self, value):
+        try:
+            return THUMBNAIL_CACHE.decode_image_data(value, MAX_IMAGE_BYTES)
+        except Exception as e:
+            logger.warning(f"[Notification] Image decode failed: {e}")
+            return None
 
     def new_msg_template(self):
-        return { "app_name": "", "replaces_id": 0, "icon": "", "summary": "", "body": "", "hints": {}, "img_struct": [] }
+        return { "app_name": "", "replaces_id": 0, "icon": "", "summary": "", "body": "", "hints": {}, "image": None, "image_key": None }
 
     def finalize_message(self, msg):
         app_name = msg["app_name"]
@@ -275,19 +293,22 @@ class NotificationIndicator(Button):
         
         if not app_name.strip() or app_name.startswith(":"): app_name = "System"
 
-        image_pixbuf = None
-        if msg["img_struct"]:
-            try:
-                w, h, stride, alpha, bits, data = msg["img_struct"]
-                glib_bytes = GLib.Bytes.new(data)
-                image_pixbuf = GdkPixbuf.Pixbuf.new_from_bytes(glib_bytes, GdkPixbuf.Colorspace.RGB, alpha, bits, w, h, stride)
-            except: pass
-
         sync_tag = msg["hints"].get("x-canonical-private-synchronous")
 
-        GLib.idle_add(
-            self.dashboard.add_or_update_notification,
-            app_name, msg["summary"], msg["body"],
-            datetime.datetime.now().strftime("%H:%M"),
-            image_pixbuf, msg["icon"], msg["replaces_id"], sync_tag
-        )
\ No newline at end of file
+        track_key = None
+        if sync_tag: track_key = f"sync:{sync_tag}"
+        elif msg["replaces_id"] and int(msg["replaces_id"]) > 0: track_key = f"id:{msg['replaces_id']}"
+
+        # The INSERT/COMMIT and the thumbnail PNG happen on the history writer
+        self.history.record_async(
+            app_name, msg["summary"], msg["body"], msg["icon"],
+            track_key, msg["image_key"], msg["image"]
+        ).add_done_callback(self.on_stored)
+
+    def on_stored(self, future):
+        try:
+            record = future.result()
+        except Exception as e:
+            logger.error(f"[Notification] Failed to store notification: {e}")
+            return
+        self.batcher.push(record)
\ No newline at end of file
@@ -1,9 +1,10 @@
-import json
-import subprocess
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
-from gi.repository import GLib # type: ignore
-from src.utils.threads import run_in_thread
+from src.utils.pipewire import PIPEWIRE, CaptureStream
+from src.utils.tooltip import LazyTooltip, escape
+from src.utils.privacy_log import PRIVACY_LOG, KIND_MIC, KIND_SCREEN, KIND_CAMERA
+from src.utils.camera import CameraWatcher
+from src.popup.privacy_log import privacy_log_popup
 
 class PrivacyIndicator(Box):
     def __init__(self, **kwargs):
@@ -19,108 +20,89 @@ class PrivacyIndicator(Box):
         self.mic_button = Button(
             name="privacy-mic",
             visible=False,
-            label="󰍬"
+            label="󰍬",
+            on_clicked=lambda *_: privacy_log_popup().toggle()
         )
         
         self.screen_button = Button(
             name="privacy-screen",
             visible=False,
-            label=""
+            label="",
+            on_clicked=lambda *_: privacy_log_popup().toggle()
         )
 
+        self.camera_button = Button(
+            name="privacy-camera",
+            visible=False,
+            label="󰄀",
+            on_clicked=lambda *_: privacy_log_popup().toggle()
+        )
+
+        self.add(self.camera_button)
         self.add(self.screen_button)
         self.add(self.mic_button)
 
-        self.poll_interval = 1500
-        GLib.timeout_add(self.poll_interval, self.check_privacy_status)
-        self.check_privacy_status()
-
-    def check_privacy_status(self):
-        self.fetch_privacy_status()
-        return True
-
-    @run_in_thread
-    def fetch_privacy_status(self):
-        try:
-            result = subprocess.run(
-                ["pw-dump"], 
-                capture_output=True, 
-                text=True
-            )
-            
-            if result.returncode != 0:
-                return
-
-            data = json.loads(result.stdout)
-            
-            mic_apps = set()
-            screen_apps = set()
-
-            for obj in data:
-                if obj.get("type") != "PipeWire:Interface:Node":
-                    continue
-                
-                props = obj.get("info", {}).get("props", {})
-                media_class = props.get("media.class", "")
-                
-                # --- BETTER NAME RESOLUTION ---
-                # check these keys in order until we find a non-empty string
-                app_name = (
-                    props.get("application.name") or 
-                    props.get("node.description") or 
-                    props.get("node.nick") or 
-                    props.get("media.name") or 
-                    "Unknown Application"
-                )
-
-                # Check Microphone
-                if media_class == "Stream/Input/Audio":
-                    # Ignore the volume mixer itself and cava
-                    if app_name not in ["pavucontrol", "WirePlumber", "PipeWire", "cava"]:
-                         mic_apps.add(app_name)
-
-                # Check Screenshare
-                if media_class == "Stream/Input/Video":
-                    screen_apps.add(app_name)
-
-            GLib.idle_add(self.update_ui, mic_apps, screen_apps)
-
-        except Exception as e:
-            print(f"PrivacyIndicator Error: {e}")
-
-    def update_ui(self, mic_apps, screen_apps):
+        # App lists are only joined into a tooltip when one is hovered
+        self.mic_tooltip = LazyTooltip(self.mic_button, self.apps_tooltip)
+        self.screen_tooltip = LazyTooltip(self.screen_button, self.apps_tooltip)
+        self.camera_tooltip = LazyTooltip(self.camera_button, self.apps_tooltip)
+
+        # Webcams are used either through PipeWire or by opening /dev/video* directly
+        self.streams: dict[int, CaptureStream] = {}
+        self.device_camera_apps: set[str] = set()
+
+        # Both sources push their changes, no polling
+        PIPEWIRE.subscribe(self.on_streams_changed)
+        self.camera_watcher = CameraWatcher()
+        self.camera_watcher.subscribe(self.on_camera_holders_changed)
+
+    def on_streams_changed(self, streams: dict[int, CaptureStream]):
+        self.streams = streams
+        self.refresh()
+
+    def on_camera_holders_changed(self, apps: set[str]):
+        self.device_camera_apps = apps
+        self.refresh()
+
+    def refresh(self):
+        streams = self.streams.values()
+        mic_apps = {s.app_name for s in streams if s.is_audio}
+        screen_apps = {s.app_name for s in streams if not s.is_audio and not s.camera}
+        camera_apps = {s.app_name for s in streams if s.camera} | self.device_camera_apps
+        PRIVACY_LOG.update(KIND_MIC, mic_apps)
+        PRIVACY_LOG.update(KIND_SCREEN, screen_apps)
+        PRIVACY_LOG.update(KIND_CAMERA, camera_apps)
+        self.update_ui(mic_apps, screen_apps, camera_apps)
+
+    @staticmethod
+    def apps_tooltip(apps) -> str:
+        return escape(", ".join(sorted(apps)))
+
+    @staticmethod
+    def set_button_active(button, active: bool):
+        if button.get_visible() != active:
+            button.set_visible(active)
+            if active:
+                button.add_style_class("active")
+            else:
+                button.remove_style_class("active")
+
+    def update_ui(self, mic_apps, screen_apps, camera_apps):
         """
         Updates UI visibility and sets tooltips based on the apps found.
         """
-        # --- Microphone Update ---
-        is_mic_active = len(mic_apps) > 0
-        if self.mic_button.get_visible() != is_mic_active:
-            self.mic_button.set_visible(is_mic_active)
-            if is_mic_active:
-                self.mic_button.add_style_class("active")
-            else:
-                self.mic_button.remove_style_class("active")
-        
-        # Set Mic Tooltip
-        if is_mic_active:
-            self.mic_button.set_tooltip_text(f"{', '.join(mic_apps)}")
-
-        # --- Screenshare Update ---
-        is_screen_active = len(screen_apps) > 0
-        if self.screen_button.get_visible() != is_screen_active:
-            self.screen_button.set_visible(is_screen_active)
-            if is_screen_active:
-                self.screen_button.add_style_class("active")
-            else:
-                self.screen_button.remove_style_class("active")
+        self.set_button_active(self.mic_button, bool(mic_apps))
+        self.mic_tooltip.update(frozenset(mic_apps))
+
+        self.set_button_active(self.screen_button, bool(screen_apps))
+        self.screen_tooltip.update(frozenset(screen_apps))
 
-        # Set Screen Tooltip
-        if is_screen_active:
-            self.screen_button.set_tooltip_text(f"{', '.join(screen_apps)}")
+        self.set_button_active(self.camera_button, bool(camera_apps))
+        self.camera_tooltip.update(frozenset(camera_apps))
 
         # --- Container Visibility ---
-        should_show = is_mic_active or is_screen_active
+        should_show = bool(mic_apps or screen_apps or camera_apps)
         if self.get_visible() != should_show:
             self.set_visible(should_show)
         
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,49 @@
+import gi
+gi.require_version('Gtk', '3.0')
+from gi.repository import Gtk # type: ignore
+
+class Sparkline(Gtk.DrawingArea):
+    """Small cairo line chart of a series, colored with the widget's CSS color."""
+
+    def __init__(self, width=180, height=36, line_width=1.5):
+        super().__init__()
+        self.set_size_request(width, height)
+        self.line_width = line_width
+        self.values = []
+        self.lower = 0.0
+        self.upper = 100.0
+        self.connect("draw", self.on_draw)
+
+    def set_series(self, values, lower=None, upper=None):
+        """Sets the values to draw. Bounds default to the series' own range."""
+        self.values = values
+        if values:
+            self.lower = min(values) if lower is None else lower
+            self.upper = max(values) if upper is None else upper
+        self.queue_draw()
+
+    def on_draw(self, widget, cr):
+        if len(self.values) < 2: return
+
+        w = self.get_allocated_width()
+        h = self.get_allocated_height()
+        span = (self.upper - self.lower) or 1.0
+        step = w / (len(self.values) - 1)
+        color = self.get_style_context().get_color(Gtk.StateFlags.NORMAL)
+
+        cr.move_to(0, h)
+        for i, value in enumerate(self.values):
+            y = h - (min(max(value, self.lower), self.upper) - self.lower) / span * (h - self.line_width)
+            cr.line_to(i * step, y)
+        cr.line_to(w, h)
+        cr.close_path()
+        cr.set_source_rgba(color.red, color.green, color.blue, 0.25)
+        cr.fill()
+
+        # Stroke only the top edge, not the closing baseline
+        for i, value in enumerate(self.values):
+            y = h - (min(max(value, self.lower), self.upper) - self.lower) / span * (h - self.line_width)
+            cr.line_to(i * step, y)
+        cr.set_source_rgba(color.red, color.green, color.blue, 1.0)
+        cr.set_line_width(self.line_width)
+        cr.stroke()
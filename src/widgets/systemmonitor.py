@@ -2,13 +2,37 @@ from fabric.widgets.box import Box
 from fabric.widgets.label import Label
 from fabric.widgets.button import Button # Imported Button
 from loguru import logger
-import psutil
 import threading
 import time
+from dataclasses import dataclass
 
 from gi.repository import GLib, Gtk  # type:ignore
 
 from src.config import SHELL_CONFIG
+from src.utils.sysmon_engine import SysmonEngine, Snapshot, AdaptiveScheduler
+from src.utils.ringbuffer import RingBuffer
+from src.utils.uevent import UEVENTS
+from src.utils.psi import PressureMonitor
+from src.utils.thresholds import ThresholdSet
+from src.utils.tooltip import LazyTooltip, escape
+from src.widgets.sparkline import Sparkline
+from src.popup.processes import ProcessPopup
+
+# Throughput above this (bytes/s) is shown in the strip even without always_show_info
+BUSY_RATE = 1024 * 1024
+
+def format_rate(value: float) -> str:
+    for unit in ("B", "K", "M", "G"):
+        if value < 1024:
+            return f"{value:.0f}{unit}/s" if unit == "B" else f"{value:.1f}{unit}/s"
+        value /= 1024
+    return f"{value:.1f}T/s"
+
+@dataclass(slots=True, frozen=True)
+class LabelView:
+    """What one sysmon label should show, computed off the GTK thread."""
+    text: str
+    warning: bool
 
 # Inherit from Button to make the entire widget clickable
 class SystemMonitor(Button):
@@ -17,6 +41,8 @@ class SystemMonitor(Button):
         self.mem_label = Label("mem")
         self.temp_label = Label("temp", style_classes="temp-icon")
         self.fan_label = Label("fan")
+        self.net_label = Label("net")
+        self.disk_label = Label("disk")
         self.must_always_show_info = SHELL_CONFIG.sysmon.get("always_show_info", False)
         
         # We create a Box to hold the labels (preserving your original layout)
@@ -27,7 +53,9 @@ class SystemMonitor(Button):
                 self.cpu_label,
                 self.mem_label,
                 self.temp_label,
-                self.fan_label
+                self.fan_label,
+                self.net_label,
+                self.disk_label
             ]
         )
         content_box.set_halign(Gtk.Align.CENTER)
@@ -41,147 +69,268 @@ class SystemMonitor(Button):
             on_clicked=self._on_clicked
         )
 
+        # Right click (or left click without exec_on_click) lists the top consumers
+        self.process_popup = ProcessPopup()
+        self.connect("button-press-event", self._on_button_press)
+
+        self.engine = SysmonEngine()
+        # Sensors are resolved once, a rescan only follows hwmon hotplug
+        UEVENTS.subscribe("hwmon", self.engine.sensors.invalidate)
+
+        # --- THRESHOLDS ---
+        self.thresholds = ThresholdSet(SHELL_CONFIG.sysmon.get("thresholds", {}))
+
+        # --- PRESSURE ---
+        # PSI triggers wake the sampler as soon as the kernel reports a stall
+        self.wake = threading.Event()
+        self.psi = PressureMonitor()
+        self.psi.subscribe(lambda _: self.wake.set())
+
+        # --- SCHEDULING ---
+        self.scheduler = AdaptiveScheduler(
+            self.config_seconds("interval", 2),
+            self.config_seconds("min_interval", 0.5),
+            self.config_seconds("max_interval", 10)
+        )
+
+        # --- HISTORY ---
+        # Fixed-size series, allocated once so the configured time span
+        # still fits when sampling at the fastest rate
+        self.history_seconds = SHELL_CONFIG.sysmon.get("history_minutes", 10) * 60
+        capacity = int(self.history_seconds / self.scheduler.min_interval) + 1
+        self.series = {
+            self.cpu_label: (RingBuffer(capacity), 0, 100, lambda v: f"{v:.0f}󰏰"),
+            self.mem_label: (RingBuffer(capacity), 0, 100, lambda v: f"{v:.0f}󰏰"),
+            self.temp_label: (RingBuffer(capacity), None, None, lambda v: f"{v:.0f}°C"),
+            self.fan_label: (RingBuffer(capacity), 0, None, lambda v: f"{v:.0f} RPM"),
+            self.net_label: (RingBuffer(capacity), 0, None, format_rate),
+            self.disk_label: (RingBuffer(capacity), 0, None, format_rate),
+        }
+        self.tooltip_widgets = {}
+        self.committed = {}
+
+        # --- TOOLTIPS ---
+        # Each tick only hands the snapshot over, markup is built on hover
+        self.tooltips = [
+            LazyTooltip(label, builder, self.render_tooltip)
+            for label, builder in (
+                (self.cpu_label, self.cpu_tooltip),
+                (self.mem_label, self.mem_tooltip),
+                (self.temp_label, self.temp_tooltip),
+                (self.fan_label, self.fan_tooltip),
+                (self.net_label, self.net_tooltip),
+                (self.disk_label, self.disk_tooltip),
+            )
+        ]
+
         threading.Thread(target=self.update_stats, daemon=True).start()
 
+    def config_seconds(self, key, default):
+        value = SHELL_CONFIG.sysmon.get(key, default)
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+            logger.warning(f"Expected a positive number in \"{key}\", got {value!r}")
+            logger.warning(f"Setting {key} to {default} seconds anyways")
+            return default
+        return value
+
+    def load(self, snap: Snapshot) -> float:
+        """How close the closest metric is to its warning threshold (1.0 = warning)."""
+        loads = [self.thresholds.load("cpu_avg", snap.cpu_avg), self.thresholds.load("memory", snap.mem_percent)]
+        if snap.cpu_percent: loads.append(self.thresholds.load("cpu_core", max(snap.cpu_percent)))
+        if snap.temp is not None: loads.append(self.thresholds.load("temp", snap.temp))
+        if any(self.psi.stalled(r) for r in ("cpu", "memory", "io")): loads.append(1.0)
+        return max(loads)
+
     def _on_clicked(self, _):
         execution = SHELL_CONFIG.sysmon.get("exec_on_click", "")
         if not execution:
-            return
+            self.process_popup.toggle()
         else:
             GLib.spawn_command_line_async(execution)
 
-    def update_temp(self):
-        sensor_data = psutil.sensors_temperatures()
-        if not sensor_data:
-           self.temp_label.set_text(" --°C")
-           return
-
-        # Priority list for CPU temperature keys on Linux
-        priority_keys = ["coretemp", "k10temp", "tctl", "cpu_thermal", "thinkpad"]
-    
-        # Find the first available key from our priority list
-        found_key = next((k for k in priority_keys if k in sensor_data), None)
-    
-        # Fallback: if no priority key is found, just take the first available sensor
-        if not found_key:
-            found_key = next(iter(sensor_data))
-
-        entries = sensor_data[found_key]
-        # Usually, the first entry (Package/Die) is the overall CPU temp
-        current_temp = int(entries[0].current)
-    
-        # Build Tooltip
-        tooltip_lines = []
-        for entry in entries:
-            label = entry.label or "Sensor"
-            tooltip_lines.append(f"{label}: <b>{int(entry.current)}°C</b>")
-    
-        self.temp_label.set_tooltip_markup("\n".join(tooltip_lines))
-
-        # UI Logic
-        if current_temp >= 90:
-            self.temp_label.set_text(f" {current_temp}°C")
-            self.temp_label.add_style_class("warning")
+    def _on_button_press(self, _, event):
+        if event.button == 3:
+            self.process_popup.toggle()
+            return True
+        return False
+
+    def render_tooltip(self, label, tooltip, markup) -> bool:
+        """Shows the markup above a sparkline of the metric's history."""
+        if label not in self.tooltip_widgets:
+            text = Gtk.Label(xalign=0)
+            sparkline = Sparkline()
+            box = Box(orientation="v", spacing=6, children=[text, sparkline])
+            box.show_all()
+            self.tooltip_widgets[label] = (box, text, sparkline)
+        box, text, sparkline = self.tooltip_widgets[label]
+
+        series, lower, upper, fmt = self.series[label]
+        count = series.count_since(self.history_seconds)
+        if count > 1:
+            minutes = self.history_seconds // 60
+            markup += (f"\n\n<small>Last {minutes} min: min <b>{fmt(series.min(count))}</b>"
+                       f" · avg <b>{fmt(series.avg(count))}</b>"
+                       f" · max <b>{fmt(series.max(count))}</b></small>")
+            sparkline.set_series(series.window(count), lower, upper)
+            sparkline.set_visible(True)
         else:
-            label_text = f" {current_temp}°C" if self.must_always_show_info else ""
-            self.temp_label.set_text(label_text)
-            self.temp_label.remove_style_class("warning")
+            sparkline.set_visible(False)
+
+        text.set_markup(markup.rstrip("\n"))
+        tooltip.set_custom(box)
+        return True
 
-    def update_mem(self):
-        virt_mem = psutil.virtual_memory()
+    # --- TOOLTIPS (GTK thread, only built while hovered) ---
+    def pressure_line(self, resource: str) -> str:
+        avg10 = self.psi.avg10(resource)
+        if avg10 is None: return ""
+        return f"\nStalled: <b>{avg10:.1f}󰏰</b> of the last 10s"
+
+    def temp_tooltip(self, snap: Snapshot) -> str:
+        return "\n".join(f"{escape(label)}: <b>{value}°C</b>" for label, value in snap.temps)
+
+    def mem_tooltip(self, snap: Snapshot) -> str:
         tooltip = "<b>Memory:</b>\n"
         # Kept your division by 1028, though standard is 1024
-        formatted_used = '%.2f' % (virt_mem.used / 1028 / 1028 / 1028) + "G"
-        formatted_free = '%.2f' % (virt_mem.free / 1028 / 1028 / 1028) + "G"
-        formatted_perc = f"{virt_mem.percent}󰏰"
-
-        self.mem_label.set_text("")
-        tooltip += f"Used: {formatted_used} {formatted_perc}\nFree: {formatted_free}\n"
+        formatted_used = '%.2f' % (snap.mem_used / 1028 / 1028 / 1028) + "G"
+        formatted_free = '%.2f' % (snap.mem_free / 1028 / 1028 / 1028) + "G"
+        tooltip += f"Used: {formatted_used} {snap.mem_percent}󰏰\nFree: {formatted_free}\n"
 
-        swap_mem = psutil.swap_memory()
-        if swap_mem.total == 0:
+        if snap.swap_total == 0:
             tooltip += "No swap memory"
         else:
             tooltip += "\n<b>Swap:</b>\n"
-            formatted_swap_used = '%.2f' % (swap_mem.used / 1028 / 1028 / 1028) + "G"
-            formatted_swap_free = '%.2f' % (swap_mem.free / 1028 / 1028 / 1028) + "G"
-            tooltip += f"Used: {formatted_swap_used} ({swap_mem.percent}󰏰)\nFree: {formatted_swap_free}"
-        self.mem_label.set_tooltip_markup(tooltip)
+            formatted_swap_used = '%.2f' % (snap.swap_used / 1028 / 1028 / 1028) + "G"
+            formatted_swap_free = '%.2f' % (snap.swap_free / 1028 / 1028 / 1028) + "G"
+            tooltip += f"Used: {formatted_swap_used} ({snap.swap_percent}󰏰)\nFree: {formatted_swap_free}"
+        return tooltip + self.pressure_line("memory")
+
+    def cpu_tooltip(self, snap: Snapshot) -> str:
+        tooltip = ''
+        ii = 0
+        freqs = snap.cpu_freqs
+        for i in snap.cpu_percent:
+            freq = f" · {freqs[ii]} MHz" if ii < len(freqs) else ""
+            tooltip = tooltip + f"Core {ii} <b>{i}󰏰</b>{freq}\n"
+            ii += 1
+        if snap.throttle_events:
+            tooltip += f"\n<b>Thermal throttling</b> ({snap.throttle_events} events since last check)"
+        elif snap.throttle_total:
+            tooltip += f"\nNot throttling ({snap.throttle_total} events since boot)"
+        if snap.platform_profile:
+            tooltip += f"\nProfile: <b>{escape(snap.platform_profile)}</b>"
+        return tooltip.rstrip("\n") + self.pressure_line("cpu")
 
+    def fan_tooltip(self, snap: Snapshot) -> str:
+        return f"Fan: <b>{snap.fan_rpm} RPM</b>" if snap.fan_rpm else ""
 
-        if virt_mem.percent >= 70.0:
-            self.mem_label.set_text(f" {formatted_perc}")
-            self.mem_label.add_style_class("warning")
-        else:
-            if self.must_always_show_info:
-                self.mem_label.set_text(f" {formatted_perc}")
-            self.mem_label.remove_style_class("warning")
+    @staticmethod
+    def throughput_tooltip(devices: list, names: tuple[str, str]) -> str:
+        return "\n".join(
+            f"{escape(name)}: {names[0]} <b>{format_rate(a)}</b> · {names[1]} <b>{format_rate(b)}</b>"
+            for name, a, b in devices
+        )
 
-    def update_cpu(self):
-        perc_per_cpu = psutil.cpu_percent(percpu=True)
-        avg_perc = round(sum(perc_per_cpu) / len(perc_per_cpu), 1)
+    def net_tooltip(self, snap: Snapshot) -> str:
+        return self.throughput_tooltip(snap.net, ("↓", "↑"))
 
-        is_cpu_consoooooooooming = avg_perc >= 60 or any(core > 80 for core in perc_per_cpu)
+    def disk_tooltip(self, snap: Snapshot) -> str:
+        return self.throughput_tooltip(snap.disks, ("read", "write")) + self.pressure_line("io")
 
-        self.cpu_label.set_text(f"󰍛")
+    # --- VIEW MODEL (sampling thread, no GTK calls) ---
+    def temp_view(self, snap: Snapshot) -> LabelView:
+        if snap.temp is None:
+           return LabelView(" --°C", False)
 
-        tooltip = ''
-        ii = 0
-        for i in perc_per_cpu:
-            tooltip = tooltip + f"Core {ii} <b>{i}󰏰</b>\n"
-            ii += 1
-        
-        self.cpu_label.set_tooltip_markup(tooltip)
+        current_temp = snap.temp
+        if self.thresholds.check("temp", current_temp):
+            return LabelView(f" {current_temp}°C", True)
+        label_text = f" {current_temp}°C" if self.must_always_show_info else ""
+        return LabelView(label_text, False)
+
+    def mem_view(self, snap: Snapshot) -> LabelView:
+        formatted_perc = f"{snap.mem_percent}󰏰"
+        if self.thresholds.check("memory", snap.mem_percent) or self.psi.stalled("memory"):
+            return LabelView(f" {formatted_perc}", True)
+        return LabelView(f" {formatted_perc}" if self.must_always_show_info else "", False)
+
+    def cpu_view(self, snap: Snapshot) -> LabelView:
+        perc_per_cpu = snap.cpu_percent
+        avg_perc = snap.cpu_avg
+
+        # Both thresholds see every sample, their dwell timers must not be skipped
+        avg_warning = self.thresholds.check("cpu_avg", avg_perc)
+        core_warning = self.thresholds.check("cpu_core", max(perc_per_cpu, default=0))
+        is_cpu_consoooooooooming = avg_warning or core_warning or self.psi.stalled("cpu")
 
         if is_cpu_consoooooooooming:
-            self.cpu_label.set_text(f"󰍛 {avg_perc}󰏰")
-            self.cpu_label.add_style_class("warning")
-        else:
-            if self.must_always_show_info:
-                self.cpu_label.set_text(f"󰍛 {avg_perc}󰏰")
-            self.cpu_label.remove_style_class("warning")
-
-    def _get_cpu_fan_rpm(self) -> int:
-        """
-        Fetches the current CPU fan speed as an integer.
-        Returns 0 if no fan is found or if the sensor is unavailable.
-        """
-        try:
-            fans = psutil.sensors_fans()
-            if not fans:
-                logger.warning("No fan found. Will always return zero")
-                return 0
-
-            for device in fans.values():
-                for entry in device:
-                    if 'cpu' in (entry.label or '').lower():
-                        return int(entry.current)
-
-            first_device_name = next(iter(fans))
-            return int(fans[first_device_name][0].current)
-        
-        except (IndexError, KeyError, StopIteration):
-            logger.warning("Couldn't find a fan. Will always return zero")
-            return 0
-        
-    def update_fan(self):
-        fan = self._get_cpu_fan_rpm()
+            return LabelView(f"󰍛 {avg_perc}󰏰", True)
+        return LabelView(f"󰍛 {avg_perc}󰏰" if self.must_always_show_info else "󰍛", False)
+
+    def fan_view(self, snap: Snapshot) -> LabelView:
+        fan = snap.fan_rpm
+        return LabelView(f"󰈐 {'' if fan == 0 else fan}", False)
+
+    def throughput_view(self, icon: str, down: float, up: float, warning: bool = False) -> LabelView:
+        if warning or self.must_always_show_info or down + up >= BUSY_RATE:
+            return LabelView(f"{icon} ↓{format_rate(down)} ↑{format_rate(up)}", warning)
+        return LabelView(icon, False)
 
-        self.fan_label.set_text(f"󰈐 {'' if fan == 0 else fan}")
+    def net_view(self, snap: Snapshot) -> LabelView:
+        return self.throughput_view("󰛳", snap.net_rx, snap.net_tx)
+
+    def disk_view(self, snap: Snapshot) -> LabelView:
+        return self.throughput_view("󰋊", snap.disk_read, snap.disk_write, self.psi.stalled("io"))
+
+    def build_view(self, snap: Snapshot) -> dict:
+        return {
+            self.cpu_label: self.cpu_view(snap),
+            self.mem_label: self.mem_view(snap),
+            self.temp_label: self.temp_view(snap),
+            self.fan_label: self.fan_view(snap),
+            self.net_label: self.net_view(snap),
+            self.disk_label: self.disk_view(snap),
+        }
+
+    # --- UI COMMIT (GTK thread) ---
+    def commit(self, view: dict):
+        """Applies a view model, touching only what differs from the last commit."""
+        for label, state in view.items():
+            previous = self.committed.get(label)
+            if previous is None or previous.text != state.text:
+                label.set_text(state.text)
+            if previous is None or previous.warning != state.warning:
+                if state.warning: label.add_style_class("warning")
+                else: label.remove_style_class("warning")
+            self.committed[label] = state
+        return False
+
+    def record_history(self, snap: Snapshot):
+        now = time.monotonic()
+        self.series[self.cpu_label][0].append(snap.cpu_avg, now)
+        self.series[self.mem_label][0].append(snap.mem_percent, now)
+        if snap.temp is not None: self.series[self.temp_label][0].append(snap.temp, now)
+        if snap.fan_rpm: self.series[self.fan_label][0].append(snap.fan_rpm, now)
+        self.series[self.net_label][0].append(snap.net_rx + snap.net_tx, now)
+        self.series[self.disk_label][0].append(snap.disk_read + snap.disk_write, now)
 
     def update_stats(self):
-        time_sleep = SHELL_CONFIG.sysmon.get("interval", 2)
-        if not isinstance(time_sleep, int) or isinstance(time_sleep, bool):
-            logger.warning(f"Expected int in \"interval\", got {type(time_sleep).__name__}")
-            logger.warning("Setting interval to 2 seconds anyways")
-            time_sleep = 2
+        time_sleep = self.scheduler.interval
+        last_view = None
         while True:
             try:
-                GLib.idle_add(self.update_temp)
-                GLib.idle_add(self.update_mem)
-                GLib.idle_add(self.update_cpu)
-                GLib.idle_add(self.update_fan)
+                # One snapshot per tick, turned into one view model and one commit
+                snap = self.engine.sample()
+                self.record_history(snap)
+                for tooltip in self.tooltips: tooltip.update(snap)
+                view = self.build_view(snap)
+                if view != last_view:
+                    GLib.idle_add(self.commit, view)
+                    last_view = view
+                time_sleep = self.scheduler.next_interval(self.load(snap))
             except Exception as e:
                 logger.error(f"Error in SystemMonitor loop: {e}")
-            
-            time.sleep(time_sleep)
\ No newline at end of file
+
+            # Sleeps until the next tick, or until a PSI trigger fires
+            self.wake.wait(time_sleep)
+            self.wake.clear()
\ No newline at end of file
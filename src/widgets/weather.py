@@ -1,4 +1,4 @@
-import threading
+from concurrent.futures import Future
 import urllib3
 from fabric.widgets.label import Label
 from fabric.widgets.wayland import WaylandWindow as Window
@@ -7,46 +7,47 @@ from fabric.widgets.image import Image
 from fabric.widgets.button import Button
 from fabric.widgets.scrolledwindow import ScrolledWindow  # Added ScrolledWindow
 from gi.repository import GLib, Gdk # type: ignore
+from loguru import logger
 
-# Assuming your types exist in src.types.wttr
-from src.types.wttr import WEATHER_SYMBOL, WEATHER_SYMBOL_GTK, WWO_CODE, WttrInResponse, HourlyForecast
+from src.config import SHELL_CONFIG
+from src.utils.weather_cache import WeatherCache
+from src.utils.http import HTTP, HttpClient, backoff_delay
 
-def format_time(time_str: str) -> str:
-    """Converts '300' to '03:00'"""
-    return f"{time_str.zfill(4)[:2]}:{time_str.zfill(4)[2:]}"
+from src.types.wttr import WeatherReport, Hour
+
+# Added &tp=1 to get true hourly data (optional, remove if you want 3h intervals)
+DEFAULT_URL = "https://wttr.in?format=j1"
+DEFAULT_TTL = 3600
+# Failed refreshes are retried sooner than the TTL, backing off from here
+RETRY_BASE = 60
 
 class HourlyWeather(Box):
-    def __init__(self, data: HourlyForecast):
+    def __init__(self, data: Hour):
         super().__init__(orientation="v", spacing=4, style_classes="hourly-card")
         
-        time_label = Label(format_time(data["time"]), style_classes="hourly-time")
+        time_label = Label(data.time, style_classes="hourly-time")
         
         icon = Image(size=32)
-        # Fallback to a generic icon if code mapping fails
-        icon_name = WEATHER_SYMBOL_GTK.get(WWO_CODE.get(data["weatherCode"], "113"), "weather-clear")
-        icon.set_from_icon_name(icon_name)
+        icon.set_from_icon_name(data.icon_name)
         
-        temp_label = Label(f"{data['tempC']}°", style_classes="hourly-temp")
+        temp_label = Label(f"{data.temp_c}°", style_classes="hourly-temp")
         
         self.children = [time_label, icon, temp_label]
 
 class CurrentWeather(Box):
-    def __init__(self, data: WttrInResponse):
+    def __init__(self, data: WeatherReport):
         super().__init__(orientation="v", spacing=8, style_classes="current-weather")
         
-        current = data["current_condition"][0]
-        today = data["weather"][0]
-        astronomy = today["astronomy"][0]
+        current = data.current
 
         # --- Top Section: Big Temp & Icon ---
         top_box = Box(orientation="h", spacing=12, h_align="center")
         
-        icon_name = WEATHER_SYMBOL_GTK.get(WWO_CODE.get(current["weatherCode"], "113"), "weather-clear")
-        big_icon = Image(size=48, icon_name=icon_name, icon_size=48)
+        big_icon = Image(size=48, icon_name=current.icon_name, icon_size=48)
         
         temp_box = Box(orientation="v")
-        temp_label = Label(f"{current['temp_C']}°C", style_classes="big-temp")
-        feels_like = Label(f"Feels like {current['FeelsLikeC']}°C", style_classes="feels-like")
+        temp_label = Label(f"{current.temp_c}°C", style_classes="big-temp")
+        feels_like = Label(f"Feels like {current.feels_like_c}°C", style_classes="feels-like")
         temp_box.children = [temp_label, feels_like]
         
         top_box.children = [big_icon, temp_box]
@@ -63,29 +64,25 @@ class CurrentWeather(Box):
             ])
 
         # Wind
-        wind_txt = f"{current['windspeedKmph']}km/h {current['winddir16Point']}"
+        wind_txt = f"{current.wind_kmph}km/h {current.wind_dir}"
         stats_box.add(make_stat("", wind_txt, "Wind")) # Nerd font icon for wind
 
         # Moon
-        stats_box.add(make_stat("", astronomy['moon_phase'], "Moon"))
+        stats_box.add(make_stat("", data.moon_phase, "Moon"))
 
-        # Daily Snow/Rain Logic (Max probability of the day)
-        # We iterate hourly data to find max chances
-        max_rain = max(int(h['chanceofrain']) for h in today['hourly'])
-        max_snow = max(int(h['chanceofsnow']) for h in today['hourly'])
-        
-        if max_snow > 0 or float(today['totalSnow_cm']) > 0.0:
-            snow_txt = f"{max_snow}%"
-            if float(today['totalSnow_cm']) > 0:
-                snow_txt += f" ({today['totalSnow_cm']}cm)"
+        # Daily Snow/Rain Logic (Max probability of the day, computed when parsed)
+        if data.max_snow > 0 or data.total_snow_cm > 0.0:
+            snow_txt = f"{data.max_snow}%"
+            if data.total_snow_cm > 0:
+                snow_txt += f" ({data.total_snow_cm:g}cm)"
             stats_box.add(make_stat("", snow_txt, "Snow"))
-        elif max_rain > 0:
-            stats_box.add(make_stat("", f"{max_rain}%", "Rain"))
+        elif data.max_rain > 0:
+            stats_box.add(make_stat("", f"{data.max_rain}%", "Rain"))
 
         self.children = [top_box, stats_box]
 
 class WeatherWindow(Window):
-    def __init__(self, parent, data: WttrInResponse | None = None):
+    def __init__(self, parent, data: WeatherReport | None = None):
         super().__init__(
             name="WEATHER",
             layer="top",
@@ -156,7 +153,7 @@ class WeatherWindow(Window):
             Box(v_align="center", h_align="center", children=[Label("Loading Weather...")])
         ]
 
-    def render_data(self, data: WttrInResponse):
+    def render_data(self, data: WeatherReport):
         # 1. Clear previous content
         self.box.children = []
 
@@ -180,47 +177,119 @@ class WeatherWindow(Window):
         # Add today's hourly data
         # Note: Wttr.in sometimes returns 3-hour intervals. 
         # If you want smooth scrolling, ensure enough items exist.
-        for hourly in data["weather"][0]["hourly"]:
+        for hourly in data.hourly:
             hourly_box.add(HourlyWeather(hourly))
             
         scroll.add(hourly_box)
         self.box.add(scroll)
 
-    def on_data_update(self, data: WttrInResponse):
+    def on_data_update(self, data: WeatherReport):
         # Called when window is open and new data arrives
         self.render_data(data)
 
+def parse_wttr(resp: urllib3.BaseHTTPResponse, etag: str | None = None):
+    """Returns (status, data, date, etag) of a wttr.in response, data is None on 304 and on errors."""
+    if resp.status == 304:
+        return resp.status, None, resp.headers.get("Date"), etag
+    if resp.status == 200:
+        return resp.status, resp.json(), resp.headers.get("Date"), resp.headers.get("ETag")
+    return resp.status, None, None, None
+
+def fetch_wttr(url: str, etag: str | None = None, client: HttpClient = HTTP) -> Future:
+    """
+    One conditional GET of a wttr.in style JSON endpoint on the shared client.
+    The Future resolves to parse_wttr's tuple.
+    """
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.fetch("GET", url, headers, parse=lambda resp: parse_wttr(resp, etag))
+
 class Weather(Button):
     def __init__(self):
-        super().__init__(label=" -°C", style_classes="weather")
+        super().__init__(label=" -°C", style_classes="weather")
         
-        self.data: None | WttrInResponse = None
+        self.data: None | WeatherReport = None
         self.window: WeatherWindow | None = None
+        self.refresh_timer = None
+        self.failures = 0
+
+        self.url = SHELL_CONFIG.weather.get("url", DEFAULT_URL)
+        self.ttl = SHELL_CONFIG.weather.get("ttl", DEFAULT_TTL)
+        if not isinstance(self.ttl, (int, float)) or isinstance(self.ttl, bool) or self.ttl <= 0:
+            logger.warning(f"[Weather] Expected a positive number of seconds in \"ttl\", got {self.ttl!r}")
+            self.ttl = DEFAULT_TTL
         
         self.connect("clicked", self.toggle_window)
-        
-        # Initial update
+
+        # Warm start: show the last response right away, even offline,
+        # and only refetch once it is older than the TTL
+        self.cache = WeatherCache()
+        data = self.cache.load()
+        report = self.parse(data) if self.cache.valid_for(self.url) else None
+        if report is not None:
+            self.handle_data(report)
+            self.schedule_update(self.ttl - self.cache.age())
+        else:
+            # Don't let a 304 confirm a copy that can't be used
+            self.cache.etag = None
+            self.schedule_update(0)
+
+    @staticmethod
+    def parse(data) -> WeatherReport | None:
+        if data is None: return None
+        try:
+            return WeatherReport.parse(data)
+        except Exception as e:
+            logger.warning(f"[Weather] Unexpected response format: {e!r}")
+            return None
+
+    def schedule_update(self, delay: float):
+        if self.refresh_timer:
+            GLib.source_remove(self.refresh_timer)
+        self.refresh_timer = GLib.timeout_add_seconds(max(int(delay), 0), self.on_refresh_timer)
+        return False
+
+    def on_refresh_timer(self):
+        self.refresh_timer = None
         self.update()
-        # Schedule update every hour
-        GLib.timeout_add_seconds(3600, self.update)
+        return False
 
     def update(self):
-        thread = threading.Thread(target=self.fetch_weather, daemon=True)
-        thread.start()
+        etag = self.cache.etag if self.cache.valid_for(self.url) else None
+        # Overlapping refreshes share the request that is already in flight
+        fetch_wttr(self.url, etag).add_done_callback(self.on_fetched)
         return True
 
-    def fetch_weather(self):
+    def on_fetched(self, future: Future):
+        # Runs as a Future callback, which swallows exceptions: whatever
+        # happens, the next refresh has to be scheduled
+        status = None
         try:
-            # Added &tp=1 to get true hourly data (optional, remove if you want 3h intervals)
-            resp = urllib3.request("GET", "https://wttr.in?format=j1", timeout=30)
-            
-            if resp.status == 200:
-                w_data: WttrInResponse = resp.json()
-                GLib.idle_add(self.handle_data, w_data)
+            status, w_data, date, etag = future.result()
+            if status == 200:
+                # Parsed once here, the raw response only lives on in the disk cache
+                report = self.parse(w_data)
+                if report is not None:
+                    self.cache.save(self.url, w_data, date, etag)
+                    GLib.idle_add(self.handle_data, report)
+                else:
+                    status = None
+            elif status == 304:
+                # Unchanged on the server, the cached copy is good for another TTL
+                self.cache.touch()
             else:
-                print(f"Failed to fetch weather: {resp.status}")
+                logger.warning(f"[Weather] Failed to fetch weather: {status}")
         except Exception as e:
-            print(f"Error updating weather: {e}")
+            logger.warning(f"[Weather] Error updating weather: {e}")
+            status = None
+        finally:
+            if status in (200, 304):
+                self.failures = 0
+                delay = self.ttl
+            else:
+                # Don't sit on stale data for a whole TTL, but don't hammer the server either
+                delay = max(backoff_delay(self.failures, RETRY_BASE, self.ttl), RETRY_BASE / 2)
+                self.failures += 1
+            GLib.idle_add(self.schedule_update, delay)
 
     def toggle_window(self, *_):
         if self.window:
@@ -232,13 +301,11 @@ class Weather(Button):
             self.window = WeatherWindow(self, self.data)
             self.window.show_all()
 
-    def handle_data(self, data: WttrInResponse):
+    def handle_data(self, data: WeatherReport):
         self.data = data
         
         # Update the button label
-        current = data["current_condition"][0]
-        icon = WEATHER_SYMBOL.get(WWO_CODE.get(current["weatherCode"], "113"), "")
-        self.set_label(f"{icon} {current['temp_C']}°C")
+        self.set_label(f"{data.current.symbol} {data.current.temp_c}°C")
         
         # If window is open, update it live
         if self.window: